@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT
 import tkinter as tk
 from tkinter import ttk, messagebox
-from utils import apply_dark_theme, apply_light_theme, get_tokenizer
+from utils import apply_dark_theme, apply_light_theme, get_tokenizer, warm_tokenizer
 from tab_drop import DropCompileTab
 from tab_ext import ScanByExtensionTab
 from tab_refs import FindCsRefsTab
@@ -24,19 +24,43 @@ APP_TITLE = "Clipboarder GUI"
 # --- add near the top of app.py (after imports) ---
 import sys
 
+# DLL handles for the DPI setup, resolved once. Only looked up when running
+# from source on Windows; the packaged exe gets DPI awareness from its manifest.
+_USER32 = _SHCORE = None
+if sys.platform.startswith("win") and not getattr(sys, "frozen", False):
+    import ctypes
+    try:
+        _USER32 = ctypes.windll.user32
+    except OSError:
+        pass
+    try:
+        _SHCORE = ctypes.windll.shcore  # Windows 8.1+ only
+    except OSError:
+        pass
+
 def _enable_windows_dpi_awareness():
-    """Make Tk DPI-aware on Windows to avoid blurry scaling."""
-    if sys.platform.startswith("win"):
+    """Make Tk DPI-aware on Windows to avoid blurry scaling.
+
+    The packaged exe declares this in its manifest (assets/app.manifest), so
+    the runtime call is only needed when running from source.
+    """
+    if _USER32 is None:
+        return
+    try:
+        import ctypes
         try:
-            import ctypes
-            try:
-                # Windows 8.1+ (per-monitor DPI awareness)
-                ctypes.windll.shcore.SetProcessDpiAwareness(2)  # PROCESS_PER_MONITOR_DPI_AWARE
-            except Exception:
-                # Fallback (Vista+)
-                ctypes.windll.user32.SetProcessDPIAware()
-        except Exception:
+            # Windows 10 1703+ (per-monitor v2: also scales menus, dialogs, title bars)
+            if _USER32.SetProcessDpiAwarenessContext(ctypes.c_void_p(-4)):  # DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2
+                return
+        except AttributeError:
             pass
+        # Windows 8.1+ (per-monitor DPI awareness)
+        if _SHCORE is not None and _SHCORE.SetProcessDpiAwareness(2) == 0:  # PROCESS_PER_MONITOR_DPI_AWARE
+            return
+        # Fallback (Vista+)
+        _USER32.SetProcessDPIAware()
+    except Exception:
+        pass
 
 
 class App(BaseTk):
@@ -66,12 +90,20 @@ class App(BaseTk):
         nb.add(self.tab2, text="Scan Folders by Extension")
        # nb.add(self.tab3, text="Find C# References")
 
-        # gentle info messages about optional deps
-        if get_tokenizer() is None:
-            self.after(200, lambda: messagebox.showinfo(
+        # gentle info messages about optional deps; the tokenizer loads in
+        # the background so the window is not held up by it, and the main
+        # thread checks the result once it is done (Tk stays single-threaded)
+        self._tokenizer_warmup = warm_tokenizer()
+        self.after(200, self._check_tokenizer)
+
+    def _check_tokenizer(self):
+        if self._tokenizer_warmup.is_alive():
+            self.after(100, self._check_tokenizer)
+        elif get_tokenizer() is None:
+            messagebox.showinfo(
                 "Optional Dependency",
                 "Install 'tiktoken' for token-based chunking.\n\npip install tiktoken"
-            ))
+            )
 
     def _build_menu(self):
         m = tk.Menu(self)
@@ -17,7 +17,14 @@ Features in this version:
 import os
 import sys
 import re
+import mmap
 import shlex
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from urllib.parse import urlparse, unquote
 
 try:
@@ -26,11 +33,56 @@ except ImportError:
     print("Error: 'pyperclip' module not found. Install with 'pip install pyperclip'.")
     sys.exit(1)
 
+# Optional: RE2 (pip install google-re2) for the reference search
 try:
-    import tiktoken
-    TOKENIZER = tiktoken.encoding_for_model("gpt-4o")
+    import re2
 except Exception:
-    TOKENIZER = None
+    re2 = None
+
+# Files bigger than this (generated code, stray blobs) are not read at all.
+MAX_BYTES = 8 * 1024 * 1024
+
+# Below this many .cs files, scanning in-process beats starting a worker pool.
+_PARALLEL_MIN_FILES = 64
+_NEWLINE_RE = re.compile(b"\n")
+_NEWLINE_TEXT_RE = re.compile("\n")
+# Files at least this big are memory-mapped for the reference scan.
+_MMAP_MIN_BYTES = 1024 * 1024
+# Concurrent reads when combining files; the work is I/O-bound.
+_READ_WORKERS = 8
+# Files read ahead of the one being chunked when streaming.
+_READ_AHEAD = 2 * _READ_WORKERS
+# Shortest literal worth a bytes pre-check before running the regex.
+_MIN_LITERAL = 4
+# Escapes whose meaning differs between str and bytes patterns (or that
+# bytes patterns do not have at all). \x and octal escapes name a code point
+# on str but a single byte on bytes, so caf\xe9 would never match UTF-8.
+_UNICODE_ESCAPES = "bBwWsSdDuUNx0123456789"
+# One UTF-8 encoded non-ASCII character: a lead byte and its continuation bytes.
+_MULTIBYTE = rb"[\xc0-\xff][\x80-\xbf]*"
+# Atomic groups, possessive repeats and negative lookaround: widening what
+# their contents match can make the whole pattern match less.
+_NARROWING_RE = re.compile(r"\(\?>|\(\?<?!|[*+?}]\+")
+# A '{m,n}' repeat; any other '{' is a literal character to re.
+_QUANTIFIER_RE = re.compile(r"\{\d*(?:,\d*)?\}")
+# A whitespace-only line, including its newline (or the end of the text).
+_EMPTY_LINE_RE = re.compile(r"^[^\S\n]*(?:\n|\Z)", re.MULTILINE)
+# Line boundaries str.splitlines() knows besides "\n".
+_ODD_BREAKS = "\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+@lru_cache(maxsize=1)
+def _tok():
+    """
+    Return the gpt-4o tiktoken encoder, or None if tiktoken is unavailable.
+    Loaded on first use: the BPE tables are only worth paying for when the
+    user actually asks for chunking (and never in scan worker processes).
+    """
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception:
+        return None
 
 
 def get_initial_folder():
@@ -131,65 +183,610 @@ def navigate_and_select_folders(start_dir):
                 print("→ Unknown command. Try again.")
 
 
+def _iter_files(root, ext, ignore_case=False):
+    """
+    Recursively yield paths of files under `root` whose name ends with `ext`
+    (a string or a tuple of them, as for str.endswith).
+    Built on os.scandir so the entry type comes from the directory listing
+    itself; like os.walk, unreadable folders are skipped and directory
+    symlinks are not followed.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    yield from _iter_files(entry.path, ext, ignore_case)
+            elif (entry.name.lower() if ignore_case else entry.name).endswith(ext):
+                yield entry.path
+
+
 def collect_files(folder_ext_pairs):
     """
     Given a list of (folder, extension) pairs, walk each folder recursively
     and collect all files matching its extension. Returns a sorted list of paths.
     """
-    all_files = []
+    # Walk each folder once, matching all of its extensions in one endswith().
+    by_folder = {}
     for folder, ext in folder_ext_pairs:
-        for root, _, files in os.walk(folder):
-            for fname in files:
-                if fname.endswith(ext):
-                    all_files.append(os.path.join(root, fname))
+        by_folder.setdefault(folder, []).append(ext)
+
+    all_files = []
+    for folder, exts in by_folder.items():
+        all_files.extend(_iter_files(folder, tuple(exts)))
     return sorted(all_files)
 
 
+def _read_bytes(path):
+    """
+    Read a whole file as bytes. Raises OSError if it cannot be read, and
+    ValueError for files over MAX_BYTES or with a NUL byte in the first 4 KB
+    (i.e. binary content that has no business in a prompt).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MAX_BYTES:
+            raise ValueError(f"larger than {MAX_BYTES // (1024 * 1024)} MB; skipped")
+        head = f.read(4096)
+        if b"\x00" in head:
+            raise ValueError("looks like a binary file; skipped")
+        return head + f.read()
+
+
+def _read_bytes_or_error(path):
+    """_read_bytes for thread-pool use: the exception is returned, not raised."""
+    try:
+        return _read_bytes(path)
+    except Exception as e:
+        return e
+
+
+def _decode_text(raw):
+    """Decode file bytes the way text-mode open() would (UTF-8, universal newlines)."""
+    text = raw.decode("utf-8", "ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def iter_file_sections(file_paths):
+    """
+    Yield each readable file as an annotated section (filename line + text),
+    in order. Reads run on a small thread pool at most _READ_AHEAD files
+    ahead of the consumer, so only a bounded window of files is in memory.
+    """
+    it = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as ex:
+        pending = deque((path, ex.submit(_read_bytes_or_error, path))
+                        for path in islice(it, _READ_AHEAD))
+        while pending:
+            path, fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, ex.submit(_read_bytes_or_error, nxt)))
+            raw = fut.result()
+            if isinstance(raw, Exception):
+                print(f"Warning: Could not read '{path}': {raw}")
+                continue
+            yield f"# ===== File: {os.path.basename(path)} =====\n{_decode_text(raw)}"
+
+
 def combine_files_with_annotations(file_paths):
     """
     Read each file, prepend an annotation line with its filename,
     and concatenate everything into a single string.
     """
-    sections = []
-    for path in file_paths:
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Warning: Could not read '{path}': {e}")
-            continue
-        sections.append(f"# ===== File: {os.path.basename(path)} =====\n{content}")
-    return "\n\n".join(sections)
+    return "\n\n".join(iter_file_sections(file_paths))
 
 
-def split_text_by_tokens(text, max_tokens):
+def _with_separators(pieces, sep):
+    """Yield `pieces` with `sep` after all but the last: a lazy sep.join(pieces)."""
+    it = iter(pieces)
+    prev = next(it, None)
+    for piece in it:
+        yield prev + sep
+        prev = piece
+    if prev is not None:
+        yield prev
+
+
+def _ends_line(line):
+    """True if `line` (from splitlines(keepends=True)) ends in a break that
+    cannot be extended by following text (a lone '\r' might become '\r\n')."""
+    return line.splitlines()[0] != line and not line.endswith("\r")
+
+
+def iter_chunks(fragments, max_tokens):
     """
-    If tiktoken is available, split the text into chunks that
-    do not exceed `max_tokens`. Otherwise, return [text] as-is.
+    Yield chunks of at most `max_tokens` tokens from a stream of text
+    fragments, exactly as split_text_by_tokens("".join(fragments)) would cut
+    them, but holding only the chunk being built. If tiktoken is not
+    available, yield everything as one chunk.
+
+    Lines are tokenized one encode_ordinary() call each (the batch API starts
+    a thread pool per call and is slower on many short lines); chunks are cut
+    on line boundaries from a running total of the per-line counts. A line
+    split across two fragments is carried over and counted once.
     """
-    if TOKENIZER is None:
+    tok = _tok()
+    if tok is None:
         print("Warning: tiktoken not available. Copying all at once.")
-        return [text]
-
-    lines = text.splitlines(keepends=True)
-    chunks = []
-    current = ""
-    for line in lines:
-        if len(TOKENIZER.encode(current + line)) <= max_tokens:
-            current += line
-        else:
-            if current:
-                chunks.append(current)
+        yield "".join(fragments)
+        return
+
+    encode = tok.encode_ordinary
+    cur, cur_tokens = [], 0
+
+    def pack(lines):
+        nonlocal cur, cur_tokens
+        for line in lines:
+            n = len(encode(line))
+            if cur_tokens + n <= max_tokens:
+                cur.append(line)
+                cur_tokens += n
+                continue
+            if cur:
+                yield "".join(cur)
             # If a single line is already too big, put it alone
-            if len(TOKENIZER.encode(line)) > max_tokens:
+            if n > max_tokens:
                 print("Warning: One line exceeds max token size; it becomes its own chunk.")
-                chunks.append(line)
-                current = ""
+                yield line
+                cur, cur_tokens = [], 0
             else:
-                current = line
-    if current:
-        chunks.append(current)
-    return chunks
+                cur, cur_tokens = [line], n
+
+    carry = ""
+    for fragment in fragments:
+        lines = (carry + fragment).splitlines(keepends=True)
+        carry = lines.pop() if lines and not _ends_line(lines[-1]) else ""
+        yield from pack(lines)
+    if carry:
+        yield from pack([carry])
+    if cur:
+        yield "".join(cur)
+
+
+def split_text_by_tokens(text, max_tokens):
+    """
+    If tiktoken is available, split the text into chunks that
+    do not exceed `max_tokens`. Otherwise, return [text] as-is.
+    """
+    return list(iter_chunks([text], max_tokens))
+
+
+def copy_files(file_paths, strip=False, max_tokens=None):
+    """
+    Modes 1 & 3: copy the annotated files, optionally without empty lines.
+    With `max_tokens`, chunks are streamed file by file into copy_chunks
+    instead of first building (and then splitting) one combined string.
+    """
+    if not max_tokens:
+        combined = combine_files_with_annotations(file_paths)
+        if strip:
+            combined = strip_empty_lines(combined)
+        pyperclip.copy(combined)
+        print("All content copied to clipboard in one go.")
+        return
+
+    sections = iter_file_sections(file_paths)
+    if strip:
+        # Stripping the sections one by one and joining them with a single
+        # newline gives the same text as stripping the whole "\n\n" join.
+        sections = map(strip_empty_lines, sections)
+    copy_chunks(iter_chunks(_with_separators(sections, "\n" if strip else "\n\n"), max_tokens))
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern):
+    """
+    Compile `pattern` once per worker process. MULTILINE keeps ^/$ anchored
+    to line boundaries now that the whole file is searched in one go.
+
+    Where that means the same thing (see _needs_text), it is compiled as a
+    bytes pattern to run directly over file contents, with RE2 when it is
+    installed: linear-time matching, so a pathological pattern cannot
+    backtrack forever. RE2 has no lookaround or backreferences; patterns it
+    rejects are compiled with Python's re instead. Anything else stays a str
+    pattern, searched over the decoded text. A pattern that is not valid as
+    bytes is never quietly swapped for the str one: _scan_buffer picks its
+    mode from _needs_text, so the two would disagree.
+    """
+    source = _crlf_dollar(pattern)
+    if _needs_text(pattern):
+        return re.compile(source, re.MULTILINE)
+    source = source.encode("utf-8")
+    if re2 is not None:
+        try:
+            return re2.compile(b"(?m)" + source)
+        except Exception:
+            pass
+    return re.compile(source, re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _needs_text(pattern):
+    """
+    True unless `pattern` compiled as bytes matches exactly where it would
+    as str. On str, \\b \\w \\s \\d (and their negations) and IGNORECASE
+    are Unicode-aware but only ASCII on bytes, so \\bFoo\\b would match
+    inside "éFoo". A non-ASCII pattern, or a '.' or '[^...]' that must match
+    exactly one character, would see a multi-byte character as several; with
+    * or + after them the two agree. \\x and octal escapes name a code point
+    only on str, and the u and L inline flags stay on str so they behave (or
+    fail) as they always did.
+    """
+    if not pattern.isascii() or re.compile(pattern).flags & re.IGNORECASE:
+        return True
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                return True
+            i += 2
+            continue
+        if c == "(" and pattern.startswith("?", i + 1):
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                j += 1
+            if not set(pattern[i + 2:j]).isdisjoint("iuL"):
+                return True  # (?u), (?L) or a scoped (?i:...)
+        if c == "[":
+            negated = pattern.startswith("^", i + 1)
+            i += 2 if negated else 1
+            if pattern.startswith("]", i):
+                i += 1
+            while i < n and pattern[i] != "]":
+                if pattern[i] == "\\":
+                    if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                        return True
+                    i += 1
+                i += 1
+            if negated and pattern[i + 1:i + 2] not in ("*", "+"):
+                return True
+        elif c == "." and pattern[i + 1:i + 2] not in ("*", "+"):
+            return True
+        i += 1
+    return False
+
+
+def _widened(pattern):
+    """
+    Rewrite a str pattern that _needs_text keeps off bytes as a bytes pattern
+    that matches in the UTF-8 encoding wherever the str one matches the
+    decoded text, and possibly in a few more places: \\b and \\B always
+    hold, and \\w \\s \\d (and negations), '.' and classes may also take
+    any one multi-byte character. Good enough to find candidate lines in the
+    raw bytes, to be confirmed with the str pattern. Returns None when there
+    is no such rewrite (non-ASCII, IGNORECASE or VERBOSE, code points, the u
+    and L flags, or constructs that widening would narrow).
+    """
+    if not pattern.isascii() or _NARROWING_RE.search(pattern):
+        return None
+    if re.compile(pattern).flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            e = pattern[i + 1:i + 2]
+            if e in ("b", "B"):
+                out.append(b"(?:)")
+            elif e and e in "wWsSdD":
+                out.append(_widened_set(pattern[i:i + 2], False, e,
+                                        pattern[i + 2:i + 3] in ("*", "+")))
+            elif e and e in _UNICODE_ESCAPES:
+                return None
+            else:
+                out.append(pattern[i:i + 2].encode())
+            i += 2
+            continue
+        if c == "(" and pattern.startswith("?", i + 1):
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                j += 1
+            if not set(pattern[i + 2:j]).isdisjoint("iuL"):
+                return None
+        if c == "[":
+            j = i + 1
+            negated = pattern.startswith("^", j)
+            if negated:
+                j += 1
+            body_start = j
+            if pattern.startswith("]", j):
+                j += 1
+            wide = ""
+            while j < n and pattern[j] != "]":
+                if pattern[j] == "\\":
+                    e = pattern[j + 1:j + 2]
+                    if e and e in "wWsSdD":
+                        wide += e
+                    elif e and e in _UNICODE_ESCAPES and e not in ("b", "B"):
+                        return None
+                    j += 1
+                j += 1
+            repeated = pattern[j + 1:j + 2] in ("*", "+")
+            if wide or negated and not repeated:
+                out.append(_widened_set(pattern[body_start:j], negated, wide, repeated))
+            else:
+                out.append(pattern[i:j + 1].encode())
+            i = j + 1
+            continue
+        if c == "." and pattern[i + 1:i + 2] not in ("*", "+"):
+            out.append(b"(?:" + _MULTIBYTE + b"|.)")
+        else:
+            out.append(c.encode())
+        i += 1
+    return b"".join(out)
+
+
+def _widened_set(body, negated, wide, repeated):
+    """
+    The bytes stand-in for one class (`body` inside the brackets) or \\w-style
+    escape (`body` is the escape) for _widened(): it also takes any one
+    multi-byte character, and \\x1c-\\x1f when there is a \\s or \\S in
+    `wide` (str counts those as space, bytes do not). Under * or + each byte
+    of a multi-byte character can be taken on its own, which keeps it a plain
+    class where possible.
+    """
+    extra = rb"\x1c-\x1f" if set(wide) & {"s", "S"} else b""
+    body = body.encode()
+    if repeated:
+        if negated:
+            return b"(?:[^" + body + b"]|[" + extra + rb"\x80-\xff])"
+        return b"[" + body + extra + rb"\x80-\xff]"
+    if negated:
+        cls = b"[^" + body + b"]" + (b"|[" + extra + b"]" if extra else b"")
+    else:
+        cls = b"[" + body + extra + b"]"
+    return b"(?:" + _MULTIBYTE + b"|" + cls + b")"
+
+
+@lru_cache(maxsize=None)
+def _compile_prefilter(pattern):
+    """
+    The bytes pattern from _widened() for a str-only `pattern`, compiled like
+    _compile() does (RE2 first), or None if there is none or it does not
+    compile.
+    """
+    source = _widened(_crlf_dollar(pattern))
+    if source is None:
+        return None
+    if re2 is not None:
+        try:
+            return re2.compile(b"(?m)" + source)
+        except Exception:
+            pass
+    try:
+        return re.compile(source, re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _crlf_dollar(pattern):
+    """
+    Rewrite each '$' anchor (unescaped, outside a character class) as
+    \\r?$. Raw bytes keep CRLF line endings, which text-mode reads used to
+    hide, and a plain '$' would no longer match before them. (Only a match's
+    start is used, so the extra '\\r' in the span does not matter, and unlike
+    a lookahead RE2 accepts it.)
+    """
+    if "$" not in pattern:
+        return pattern
+    out = []
+    in_class = False
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            j = i + 1
+            if pattern.startswith("^", j):
+                j += 1
+            if pattern.startswith("]", j):
+                j += 1  # a leading ']' is literal
+            out.append(pattern[i:j])
+            i = j
+            continue
+        elif c == "$":
+            c = r"\r?$"
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def _required_literal(pattern):
+    """
+    Return (as UTF-8 bytes) the longest run of plain characters that every
+    match of `pattern` must contain, or b"" if there is none of at least
+    _MIN_LITERAL characters. Files lacking it can skip the regex entirely.
+
+    Deliberately conservative: alternation, case-insensitive/verbose flags and
+    escapes it does not understand make it give up, and group contents,
+    classes and anything a quantifier can make optional are never counted.
+    """
+    try:
+        flags = re.compile(pattern).flags
+    except re.error:
+        return b""
+    if flags & (re.IGNORECASE | re.VERBOSE):
+        return b""
+
+    best, run = "", []
+    depth = 0
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        lit = None
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if nxt in ("x", "u", "U", "N") or nxt.isdigit():
+                return b""  # char codes / backrefs: not worth parsing
+            if nxt and not nxt.isalnum():
+                lit = nxt  # escaped metachar, e.g. \( or \.
+            i += 2  # \b, \s, \d, ... just end the run
+        elif c == "[":
+            i += 1
+            if pattern.startswith("^", i):
+                i += 1
+            if pattern.startswith("]", i):
+                i += 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif c == "(":
+            depth += 1
+            i += 1
+        elif c == ")":
+            depth -= 1
+            i += 1
+        elif c == "|":
+            if depth == 0:
+                return b""
+            i += 1
+        elif c in "*?" or (c == "{" and _QUANTIFIER_RE.match(pattern, i)):
+            if run:
+                run.pop()  # the preceding character may not be there at all
+            i = _QUANTIFIER_RE.match(pattern, i).end() if c == "{" else i + 1
+        elif c in "+.^$":
+            i += 1
+        else:
+            lit = c
+            i += 1
+
+        if lit is not None and depth == 0:
+            run.append(lit)
+        else:
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+    if len(run) > len(best):
+        best = "".join(run)
+    return best.encode("utf-8") if len(best) >= _MIN_LITERAL else b""
+
+
+def _scan_file(path, root_folder, pattern, before, after):
+    """
+    Search a single .cs file for 'pattern' and return its snippet strings.
+    Runs inside a worker process, so it only takes picklable arguments.
+    Large files are memory-mapped instead of read into a bytes object.
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size or size > MAX_BYTES:
+                return []
+            if size < _MMAP_MIN_BYTES:
+                return _scan_buffer(f.read(), path, root_folder, pattern, before, after)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _scan_buffer(mm, path, root_folder, pattern, before, after)
+    except (OSError, ValueError):
+        return []
+
+
+def _scan_buffer(buf, path, root_folder, pattern, before, after):
+    """
+    The body of _scan_file, over a bytes-like `buf` (bytes or mmap). The regex
+    runs on the raw bytes, so only the lines around a hit are ever decoded.
+    A pattern that has to run on str (_needs_text) is swept over the bytes in
+    its widened form (_compile_prefilter), and each candidate line is then
+    decoded and checked with the str pattern; only when there is no widened
+    form is the whole file decoded first.
+    """
+    if buf.find(b"\x00", 0, 4096) != -1:
+        return []  # binary content
+    literal = _required_literal(pattern)
+    if literal and buf.find(literal) == -1:
+        return []
+
+    regex = _compile(pattern)
+    search = confirm = regex.search
+    newline_re = _NEWLINE_RE
+    if isinstance(regex.pattern, str):
+        prefilter = _compile_prefilter(pattern)
+        if prefilter is None:
+            buf = str(buf, "utf-8", "ignore")
+            if not buf:
+                return []
+            newline_re = _NEWLINE_TEXT_RE
+        else:
+            search = prefilter.search
+            # Candidates are checked one line at a time, as the old text-mode
+            # per-line search saw them: "\n"-terminated, no MULTILINE (so ^
+            # does not match again after the line's own newline)
+            line_search = re.compile(pattern).search
+
+            def confirm(data, lo, hi):
+                line = str(data[lo:hi], "utf-8", "ignore")
+                if line.endswith("\r\n"):
+                    line = line[:-2] + "\n"
+                return line_search(line)
+
+    snippets = []
+    newlines = None
+    # Compute relative path for privacy
+    rel_path = os.path.relpath(path, root_folder)
+    pos = 0
+    while True:
+        m = search(buf, pos)
+        if m is None:
+            break
+        if newlines is None:
+            # Only files with at least one hit pay for the line index.
+            newlines = array('q', (nl.start() for nl in newline_re.finditer(buf)))
+            n_lines = len(newlines) + (buf[-1] not in (0x0A, "\n"))
+        first = bisect_left(newlines, m.start())
+        if first >= n_lines:
+            break  # an empty match after the final newline
+        # \s, [^x] and the like run across newlines, so a match can begin on
+        # an earlier line than the one it is about (^\s*Foo starts on the
+        # blank line above Foo). Each line it spans is only a candidate, kept
+        # if the regex also matches within that line alone, newline included,
+        # as in the old per-line search.
+        last = min(bisect_left(newlines, max(m.start(), m.end() - 1)), n_lines - 1)
+        for idx in range(first, last + 1):
+            line_lo = newlines[idx - 1] + 1 if idx else 0
+            line_hi = newlines[idx] + 1 if idx < len(newlines) else len(buf)
+            if confirm(buf, line_lo, line_hi) is None:
+                continue
+
+            start = max(0, idx - before)
+            end = min(n_lines, idx + after + 1)
+            lo = newlines[start - 1] + 1 if start else 0
+            hi = newlines[end - 1] if end <= len(newlines) else len(buf)
+            text = buf[lo:hi]
+            if newline_re is _NEWLINE_RE:
+                text = text.decode("utf-8", "ignore")
+            lines = text.split("\n")
+
+            snippet_lines = []
+            snippet_lines.append("=" * 80)
+            snippet_lines.append(f"{rel_path} (line {idx+1}):")
+
+            for i, line in enumerate(lines, start):
+                prefix = ">>" if i == idx else "  "
+                num = str(i + 1).rjust(4)
+                snippet_lines.append(f"{prefix} {num}: {line.rstrip()}")
+            snippet_lines.append("")  # blank line at end
+            snippets.append("\n".join(snippet_lines))
+        if last >= len(newlines):
+            break
+        pos = newlines[last] + 1  # one snippet per line: go on from the next one
+    return snippets
 
 
 def find_references_with_context(root_folder, pattern, before=3, after=3):
@@ -205,40 +802,51 @@ def find_references_with_context(root_folder, pattern, before=3, after=3):
     >>47:    matching line
       48:    ...
       49:    ...
-    """
-    regex = re.compile(pattern)
-    snippets = []
 
-    for dirpath, _, filenames in os.walk(root_folder):
-        for fname in filenames:
-            if not fname.lower().endswith('.cs'):
-                continue
-            path = os.path.join(dirpath, fname)
-            try:
-                with open(path, encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-            except OSError:
-                continue
+    Files are scanned in a process pool (one worker per core) once there are
+    enough of them to pay for starting the workers.
+    """
+    _compile(pattern)  # surface a bad pattern here, not from inside a worker
 
-            for idx, line in enumerate(lines):
-                if regex.search(line):
-                    start = max(0, idx - before)
-                    end = min(len(lines), idx + after + 1)
-                    snippet_lines = []
-                    snippet_lines.append("=" * 80)
+    # Sorted: _iter_files enters subfolders as it meets them, so its order is
+    # not os.walk's (a folder's files first); the GUI sorts the same way.
+    paths = sorted(_iter_files(root_folder, '.cs', ignore_case=True))
+    scan = partial(_scan_file, root_folder=root_folder, pattern=pattern,
+                   before=before, after=after)
+    snippets = []
+    if len(paths) < _PARALLEL_MIN_FILES:
+        for res in map(scan, paths):
+            snippets.extend(res)
+    else:
+        with ProcessPoolExecutor() as ex:
+            for res in ex.map(scan, paths, chunksize=32):
+                snippets.extend(res)
 
-                    # Compute relative path for privacy
-                    rel_path = os.path.relpath(path, root_folder)
-                    snippet_lines.append(f"{rel_path} (line {idx+1}):")
+    return snippets
 
-                    for i in range(start, end):
-                        prefix = ">>" if i == idx else "  "
-                        num = str(i + 1).rjust(4)
-                        snippet_lines.append(f"{prefix} {num}: {lines[i].rstrip()}")
-                    snippet_lines.append("")  # blank line at end
-                    snippets.append("\n".join(snippet_lines))
 
-    return snippets
+def copy_chunks(chunks):
+    """
+    Copy chunks to the clipboard one at a time, waiting for Enter in between.
+    `chunks` may be any iterable: the next chunk is produced on a helper
+    thread while the user is still pasting the current one, so Enter is
+    answered right away even when chunks are built lazily.
+    """
+    total = len(chunks) if hasattr(chunks, "__len__") else None
+    it = iter(chunks)
+    idx = 0
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        pending = ex.submit(next, it, None)
+        while True:
+            chunk = pending.result()
+            if chunk is None:
+                break
+            pending = ex.submit(next, it, None)
+            idx += 1
+            pyperclip.copy(chunk)
+            label = f"{idx}/{total}" if total is not None else str(idx)
+            print(f"[{label}] chunk copied to clipboard. Press Enter to continue...")
+            input()
 
 
 # -----------------------------
@@ -263,7 +871,7 @@ def _normalize_dropped_path(p):
     if parsed and parsed.scheme == "file":
         p = unquote(parsed.path or "")
         # On Windows, file:///C:/... becomes /C:/... -> strip leading slash
-        if os.name == "nt" and re.match(r"^/[A-Za-z]:", p):
+        if os.name == "nt" and len(p) >= 3 and p[0] == "/" and p[1].isascii() and p[1].isalpha() and p[2] == ":":
             p = p.lstrip("/")
     else:
         # URL-decode if someone pasted percent-escaped path without file://
@@ -302,6 +910,7 @@ def drop_files_mode():
       - Q → back to main menu
     """
     staged = []
+    staged_set = set()  # same paths as `staged`, for O(1) duplicate checks
 
     print("\n=== Drop Files Mode ===")
     print("Instructions:")
@@ -336,13 +945,14 @@ def drop_files_mode():
             removed = 0
             for idx in to_remove:
                 if 1 <= idx <= len(staged):
-                    staged.pop(idx - 1)
+                    staged_set.discard(staged.pop(idx - 1))
                     removed += 1
             print(f"→ Removed {removed} item(s).")
             continue
 
         if cmd == "C":
             staged.clear()
+            staged_set.clear()
             print("→ Cleared all staged files.")
             continue
 
@@ -356,12 +966,10 @@ def drop_files_mode():
                 continue
 
             print(f"Found {len(staged)} file(s) staged.")
-            combined = combine_files_with_annotations(staged)
 
             #optional empty-line stripping (mode 3 only)
             strip_choice = input("Strip empty lines before copying? (y/N): ").strip().lower()
-            if strip_choice in ("y", "yes"):
-                combined = strip_empty_lines(combined)
+            strip = strip_choice in ("y", "yes")
 
             tok_input = input("Enter max token size to chunk (blank = no chunking): ").strip()
             if tok_input:
@@ -373,15 +981,7 @@ def drop_files_mode():
             else:
                 max_tokens = None
 
-            if max_tokens:
-                chunks = split_text_by_tokens(combined, max_tokens)
-                for idx, chunk in enumerate(chunks, start=1):
-                    pyperclip.copy(chunk)
-                    print(f"[{idx}/{len(chunks)}] chunk copied to clipboard. Press Enter to continue...")
-                    input()
-            else:
-                pyperclip.copy(combined)
-                print("All content copied to clipboard in one go.")
+            copy_files(staged, strip, max_tokens)
 
             again = input("Done. Press ‘C’ to return to Drop Files mode or any other key to main menu: ").strip().upper()
             if again == "C":
@@ -395,8 +995,9 @@ def drop_files_mode():
         skipped = 0
         for p in paths:
             if os.path.isfile(p):
-                if p not in staged:
+                if p not in staged_set:
                     staged.append(p)
+                    staged_set.add(p)
                     added += 1
             else:
                 # Ignore directories for Mode 3; you can handle directories via Mode 1
@@ -405,7 +1006,10 @@ def drop_files_mode():
 
 def strip_empty_lines(text: str) -> str:
     """Remove lines that are empty or whitespace-only."""
-    return "\n".join(line for line in text.splitlines() if line.strip())
+    if any(c in text for c in _ODD_BREAKS):
+        # Rare: splitlines() also breaks on these, which the regex does not
+        return "\n".join(line for line in text.splitlines() if line.strip())
+    return _EMPTY_LINE_RE.sub("", text).rstrip("\n")
 
 
 
@@ -437,11 +1041,9 @@ def main():
                     continue  # back to mode selection
 
             print(f"Found {len(all_files)} file(s) total across all selections.")
-            combined = combine_files_with_annotations(all_files)
             # optional empty-line stripping (mode 1 only)
             strip_choice = input("Strip empty lines before copying? (y/N): ").strip().lower()
-            if strip_choice in ("y", "yes"):
-                combined = strip_empty_lines(combined)
+            strip = strip_choice in ("y", "yes")
 
             tok_input = input("Enter max token size to chunk (blank = no chunking): ").strip()
             if tok_input:
@@ -453,15 +1055,7 @@ def main():
             else:
                 max_tokens = None
 
-            if max_tokens:
-                chunks = split_text_by_tokens(combined, max_tokens)
-                for idx, chunk in enumerate(chunks, start=1):
-                    pyperclip.copy(chunk)
-                    print(f"[{idx}/{len(chunks)}] chunk copied to clipboard. Press Enter to continue...")
-                    input()
-            else:
-                pyperclip.copy(combined)
-                print("All content copied to clipboard in one go.")
+            copy_files(all_files, strip, max_tokens)
 
             again = input("Done. Press ‘C’ to return to main menu or any other key to exit: ").strip().upper()
             if again == "C":
@@ -520,11 +1114,7 @@ def main():
                 max_tokens = None
 
             if max_tokens:
-                chunks = split_text_by_tokens(combined_snippets, max_tokens)
-                for idx, chunk in enumerate(chunks, start=1):
-                    pyperclip.copy(chunk)
-                    print(f"[{idx}/{len(chunks)}] chunk copied to clipboard. Press Enter to continue...")
-                    input()
+                copy_chunks(split_text_by_tokens(combined_snippets, max_tokens))
             else:
                 pyperclip.copy(combined_snippets)
                 print("All reference snippets copied to clipboard in one go.")
@@ -10,9 +10,10 @@ Usage:
   python tools/build_icon.py
 
 Requires:
-  pip install pillow
+  pip install "pillow>=9.1"
 """
 
+import struct
 from pathlib import Path
 from typing import List, Tuple
 from PIL import Image
@@ -24,12 +25,21 @@ DEFAULT_SIZES = [16, 24, 32, 48, 64, 128, 256]
 FIT = "contain"  # one of: "contain", "cover", "stretch"
 
 # --- Helpers ---
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _png_size(path: Path) -> Tuple[int, int]:
+    """Read (width, height) from the IHDR chunk without decoding the image."""
+    with open(path, "rb") as f:
+        head = f.read(24)
+    if len(head) < 24 or head[:8] != _PNG_SIGNATURE or head[12:16] != b"IHDR":
+        raise ValueError(f"Not a PNG file: {path}")
+    return struct.unpack(">II", head[16:24])
+
 def _pick_largest_png(folder: Path) -> Path | None:
     best: tuple[int, Path] | None = None
     for p in folder.glob("*.png"):
         try:
-            with Image.open(p) as im:
-                w, h = im.size
+            w, h = _png_size(p)
             px = w * h
             if best is None or px > best[0]:
                 best = (px, p)
@@ -41,7 +51,7 @@ def _resize_square(img: Image.Image, size: int, fit: str) -> Image.Image:
     assert fit in ("contain", "cover", "stretch")
     w, h = img.size
     if fit == "stretch":
-        return img.resize((size, size), Image.LANCZOS)
+        return img.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
 
     aspect = w / h
     if fit == "contain":
@@ -49,7 +59,7 @@ def _resize_square(img: Image.Image, size: int, fit: str) -> Image.Image:
             new_w, new_h = size, int(round(size / aspect))
         else:
             new_w, new_h = int(round(size * aspect)), size
-        scaled = img.resize((new_w, new_h), Image.LANCZOS)
+        scaled = img.resize((new_w, new_h), Image.Resampling.LANCZOS, reducing_gap=2.0)
         canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
         canvas.paste(scaled, ((size - new_w) // 2, (size - new_h) // 2), scaled)
         return canvas
@@ -59,7 +69,7 @@ def _resize_square(img: Image.Image, size: int, fit: str) -> Image.Image:
         new_h, new_w = size, int(round(size * aspect))
     else:
         new_w, new_h = size, int(round(size / aspect))
-    scaled = img.resize((new_w, new_h), Image.LANCZOS)
+    scaled = img.resize((new_w, new_h), Image.Resampling.LANCZOS, reducing_gap=2.0)
     left = (new_w - size) // 2
     top = (new_h - size) // 2
     return scaled.crop((left, top, left + size, top + size))
@@ -68,12 +78,17 @@ def _save_ico(src_img: Image.Image, out_path: Path, sizes: List[int], fit: str):
     sizes = sorted({int(s) for s in sizes if 1 <= int(s) <= 256})
     if not sizes:
         raise ValueError("No valid icon sizes (1..256).")
-    # Render once per size for best quality (Pillow embeds sizes from base)
-    # Choose largest as base image
-    rendered: List[Tuple[int, Image.Image]] = [(s, _resize_square(src_img, s, fit)) for s in sizes]
-    base_size, base_img = max(rendered, key=lambda t: t[0])
+    # Render once per size for best quality. Only the largest comes from the
+    # source; each smaller size is downscaled from the one above it (a mipmap
+    # chain), so no step resamples the full-resolution master again.
+    base_img = _resize_square(src_img, sizes[-1], fit)
+    rendered: List[Image.Image] = [base_img]
+    for s in reversed(sizes[:-1]):
+        rendered.append(rendered[-1].resize((s, s), Image.Resampling.LANCZOS))
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    base_img.save(out_path, format="ICO", sizes=[(s, s) for s in sizes])
+    # append_images makes Pillow embed our renders instead of rescaling base
+    base_img.save(out_path, format="ICO", sizes=[(s, s) for s in sizes],
+                  append_images=rendered[1:])
 
 # --- Main ---
 def main():
@@ -24,7 +24,14 @@ Packaging (example):
 import os
 import re
 import sys
+import io
+import mmap
+import queue
 import shlex
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urlparse, unquote
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -73,39 +80,52 @@ def copy_to_clipboard(text: str, tk_root: tk.Tk) -> None:
         tk_root.update()  # keep clipboard after app closes on macOS
     except Exception as e:
         messagebox.showerror("Clipboard Error", f"Failed to copy to clipboard:\n{e}")
-def split_text_by_tokens(text: str, max_tokens: int):
-    """Chunk text by token count if tiktoken is available; else return [text]."""
+
+
+def _warn_no_tokenizer():
+    # Optional: show one-time warning if you want
+    try:
+        messagebox.showwarning(
+            "tiktoken not available",
+            "tiktoken is not installed; copying everything in one chunk."
+        )
+    except Exception:
+        pass
+
+
+def split_text_by_tokens(text: str, max_tokens: int, tok=None):
+    """Chunk text by token count if tiktoken is available; else return [text].
+    Pass `tok` (an already resolved encoder) to skip the get_tokenizer() lookup."""
     if not max_tokens or max_tokens <= 0:
         return [text]
 
-    tok = get_tokenizer()
     if tok is None:
-        # Optional: show one-time warning if you want
-        try:
-            from tkinter import messagebox
-            messagebox.showwarning(
-                "tiktoken not available",
-                "tiktoken is not installed; copying everything in one chunk."
-            )
-        except Exception:
-            pass
+        tok = get_tokenizer()
+    if tok is None:
+        _warn_no_tokenizer()
         return [text]
 
+    # Chunk boundaries are decided from the per-line counts alone, as
+    # [start, i) line ranges that are joined once per chunk. (A plain
+    # encode_ordinary() per line: the batch API starts a thread pool per call
+    # and is slower on many short lines.)
     lines = text.splitlines(keepends=True)
-    chunks, current = [], ""
-    for line in lines:
-        if len(tok.encode(current + line)) <= max_tokens:
-            current += line
+    encode = tok.encode_ordinary
+    all_lens = [len(encode(line)) for line in lines]
+    chunks, start, running = [], 0, 0
+    for i, n in enumerate(all_lens):
+        if running + n <= max_tokens:
+            running += n
+            continue
+        if i > start:
+            chunks.append("".join(lines[start:i]))
+        if n > max_tokens:
+            chunks.append(lines[i])  # oversize single line becomes its own chunk
+            start, running = i + 1, 0
         else:
-            if current:
-                chunks.append(current)
-            if len(tok.encode(line)) > max_tokens:
-                chunks.append(line)  # oversize single line becomes its own chunk
-                current = ""
-            else:
-                current = line
-    if current:
-        chunks.append(current)
+            start, running = i, n
+    if start < len(lines):
+        chunks.append("".join(lines[start:]))
     return chunks
 
 
@@ -113,66 +133,277 @@ def strip_empty_lines(text: str) -> str:
     return "\n".join(line for line in text.splitlines() if line.strip())
 
 
-def combine_files_with_annotations(file_paths):
-    """Read each file, prepend annotation '# ===== File: name =====' and concat."""
-    sections = []
-    for path in file_paths:
+def combine_files_with_annotations(file_paths, strip=False):
+    """Read each file, prepend annotation '# ===== File: name =====' and concat.
+    With `strip`, empty lines are dropped per file while combining; the result
+    equals strip_empty_lines() of the unstripped text, without building it."""
+    basename = os.path.basename
+    sections = [None] * len(file_paths)
+    for i, path in enumerate(file_paths):
+        header = f"# ===== File: {basename(path)} ====="
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            # Binary read + one decode; newlines normalized as text mode would
+            with open(path, "rb") as f:
+                content = f.read().decode("utf-8", "ignore")
         except Exception as e:
-            sections.append(f"# ===== File: {os.path.basename(path)} =====\n"
-                            f"[Warning: Could not read '{path}': {e}]")
+            sections[i] = f"{header}\n[Warning: Could not read '{path}': {e}]"
             continue
-        sections.append(f"# ===== File: {os.path.basename(path)} =====\n{content}")
-    return "\n\n".join(sections)
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        if strip:
+            content = strip_empty_lines(content)
+            sections[i] = f"{header}\n{content}" if content else header
+        else:
+            sections[i] = f"{header}\n{content}"
+    # Stripped sections have no blank separator line between them either
+    return ("\n" if strip else "\n\n").join(sections)
+
+
+# .cs files bigger than this are skipped by the reference search.
+MAX_BYTES = 8 * 1024 * 1024
+# Directory walks and .cs reads are I/O-bound; threads overlap the waits.
+_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_NEWLINE_RE = re.compile(b"\n")
+_NEWLINE_TEXT_RE = re.compile("\n")
+# Escapes that mean something else (or nothing) in a bytes pattern; \x and
+# octal escapes are one byte there, not a code point
+_UNICODE_ESCAPES = "bBwWsSdDuUNx0123456789"
+# .cs files at least this big are memory-mapped instead of read.
+_MMAP_MIN_BYTES = 1024 * 1024
+# Every casing of ".cs": one endswith() call, no lowercased copy per name
+_CS_SUFFIXES = (".cs", ".CS", ".Cs", ".cS")
+
+
+def _walk(path, ext):
+    """
+    Yield files under `path` whose name ends with `ext` (a string or a tuple
+    of them, as for str.endswith), in os.walk order
+    (a folder's files, then its subfolders). Built on os.scandir so the
+    entry type comes from the directory read itself, without a stat per
+    entry; unreadable folders are skipped and directory symlinks are not
+    followed, as with os.walk.
+    """
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not e.is_symlink():
+                        subdirs.append(e.path)
+                elif e.name.endswith(ext):
+                    yield e.path
+    except OSError:
+        return
+    for sub in subdirs:
+        yield from _walk(sub, ext)
+
+
+def _walk_pair(pair):
+    """All files under `folder` ending with one of `exts`, for one (folder, exts) pair."""
+    folder, exts = pair
+    return list(_walk(folder, tuple(exts)))
 
 
 def collect_files(folder_ext_pairs):
     """Walk each folder recursively and collect files matching its extension."""
-    all_files = []
+    # Walk each folder once, however many extensions (or spellings of the
+    # same path) it was added with; the first spelling is the one walked.
+    by_folder = {}
     for folder, ext in folder_ext_pairs:
-        for root, _, files in os.walk(folder):
-            for fname in files:
-                if fname.endswith(ext):
-                    all_files.append(os.path.join(root, fname))
+        by_folder.setdefault(os.path.realpath(folder), (folder, set()))[1].add(ext)
+
+    all_files = []
+    with ThreadPoolExecutor(max_workers=_IO_WORKERS) as ex:
+        for found in ex.map(_walk_pair, by_folder.values()):
+            all_files.extend(found)
     return sorted(all_files)
 
 
+def _crlf_dollar(pattern):
+    """Rewrite each '$' anchor (unescaped, outside a character class) as
+    \\r?$, so it still matches before the CRLF line endings that raw bytes
+    keep. Only a match's start is used, so the extra '\\r' does no harm."""
+    if "$" not in pattern:
+        return pattern
+    out = []
+    in_class = False
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            j = i + 1
+            if pattern.startswith("^", j):
+                j += 1
+            if pattern.startswith("]", j):
+                j += 1  # a leading ']' is literal
+            out.append(pattern[i:j])
+            i = j
+            continue
+        elif c == "$":
+            c = r"\r?$"
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _needs_text(pattern):
+    """True unless `pattern` compiled as bytes matches exactly where the str
+    pattern would. On str, \\b \\w \\s \\d (and negations) and IGNORECASE
+    are Unicode-aware but ASCII-only on bytes (\\bFoo\\b would match in
+    "éFoo"); a non-ASCII pattern, or a '.' / '[^...]' that must match exactly
+    one character, would see a multi-byte character as several (followed by
+    * or + the two agree). The u and L inline flags stay on str too, so they
+    work (or fail) as before."""
+    if not pattern.isascii() or re.compile(pattern).flags & re.IGNORECASE:
+        return True
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                return True
+            i += 2
+            continue
+        if c == "(" and pattern.startswith("?", i + 1):
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                j += 1
+            if not set(pattern[i + 2:j]).isdisjoint("iuL"):
+                return True  # (?u), (?L) or a scoped (?i:...)
+        if c == "[":
+            negated = pattern.startswith("^", i + 1)
+            i += 2 if negated else 1
+            if pattern.startswith("]", i):
+                i += 1
+            while i < n and pattern[i] != "]":
+                if pattern[i] == "\\":
+                    if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                        return True
+                    i += 1
+                i += 1
+            if negated and pattern[i + 1:i + 2] not in ("*", "+"):
+                return True
+        elif c == "." and pattern[i + 1:i + 2] not in ("*", "+"):
+            return True
+        i += 1
+    return False
+
+
+def _scan_one(path, root_folder, regex, before, after):
+    """Return (n, text): the n context snippets for lines of `path` matching
+    `regex`, written into one buffer and separated by blank lines. Large
+    files are memory-mapped rather than read into memory."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # Generated code (designer/T4 output) can be huge; not worth scanning
+            if not size or size > MAX_BYTES:
+                return 0, ""
+            if size < _MMAP_MIN_BYTES:
+                return _scan_buffer(f.read(), path, root_folder, regex, before, after)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _scan_buffer(mm, path, root_folder, regex, before, after)
+    except (OSError, ValueError):
+        return 0, ""
+
+
+def _scan_buffer(data, path, root_folder, regex, before, after):
+    """The body of _scan_one over bytes or an mmap; only the lines around a
+    hit are ever decoded, unless `regex` is a str pattern (see _needs_text):
+    then it runs over the decoded file."""
+    if data.find(b"\x00", 0, 4096) != -1:
+        return 0, ""  # a binary file that happens to be named .cs
+    as_text = isinstance(regex.pattern, str)
+    if as_text:
+        data = data[:].decode("utf-8", "ignore")
+        if not data:
+            return 0, ""
+
+    # The regex sweeps the whole file; line numbers come from a bisect over
+    # the line start offsets, built only once the file turns out to match.
+    # \s, [^x] and the like run across newlines, so a match may begin on an
+    # earlier line than the one it is about (^\s*Foo starts on the blank line
+    # above Foo): every line it spans is only a candidate, kept if the regex
+    # also matches within that line alone, newline included, as the per-line
+    # search saw it.
+    buf = io.StringIO()
+    write = buf.write
+    count = 0
+    line_starts = None
+    search = regex.search
+    m = search(data)
+    while m is not None:
+        if line_starts is None:
+            line_starts = [0]
+            newline_re = _NEWLINE_TEXT_RE if as_text else _NEWLINE_RE
+            line_starts.extend(nl.end() for nl in newline_re.finditer(data))
+            # A trailing newline ends the last line; it does not start a new one
+            n_lines = len(line_starts) - (line_starts[-1] == len(data))
+            rel_path = os.path.relpath(path, root_folder)
+        first = bisect_right(line_starts, m.start()) - 1
+        if first >= n_lines:
+            break  # an empty match after the final newline
+        last = min(bisect_right(line_starts, max(m.start(), m.end() - 1)) - 1, n_lines - 1)
+        for idx in range(first, last + 1):
+            line_end = line_starts[idx + 1] if idx + 1 < len(line_starts) else len(data)
+            if search(data, line_starts[idx], line_end) is None:
+                continue
+            start = max(0, idx - before)
+            end = min(n_lines, idx + after + 1)
+            if count:
+                write("\n\n")
+            count += 1
+            write("=" * 80)
+            write(f"\n{rel_path} (line {idx+1}):\n")
+            for i in range(start, end):
+                prefix = ">>" if i == idx else "  "
+                num = str(i + 1).rjust(4)
+                line = data[line_starts[i]:line_starts[i + 1] if i + 1 < len(line_starts) else None]
+                if not as_text:
+                    line = line.decode("utf-8", "ignore")
+                write(f"{prefix} {num}: {line.rstrip()}\n")
+        if last + 1 >= len(line_starts):
+            break
+        m = search(data, line_starts[last + 1])  # one snippet per line
+    return count, buf.getvalue()
+
+
 def find_references_with_context(root_folder, pattern, before=3, after=3):
-    """Search .cs files for regex pattern and return list of context snippets."""
+    """Search .cs files for regex pattern. Returns (text, n): the n context
+    snippets found, joined with blank lines between them."""
     try:
-        regex = re.compile(pattern)
+        # Bytes pattern where it means the same, to run straight over file
+        # contents (or an mmap); MULTILINE: ^/$ still anchor at line
+        # boundaries when searching whole files
+        source = _crlf_dollar(pattern)
+        if not _needs_text(pattern):
+            source = source.encode("utf-8")
+        regex = re.compile(source, re.MULTILINE)
     except re.error as e:
         raise ValueError(f"Invalid regex: {e}") from e
 
-    snippets = []
-    for dirpath, _, filenames in os.walk(root_folder):
-        for fname in filenames:
-            if not fname.lower().endswith(".cs"):
-                continue
-            path = os.path.join(dirpath, fname)
-            try:
-                with open(path, encoding="utf-8", errors="ignore") as f:
-                    lines = f.readlines()
-            except OSError:
-                continue
+    paths = list(_walk(root_folder, _CS_SUFFIXES))
 
-            for idx, line in enumerate(lines):
-                if regex.search(line):
-                    start = max(0, idx - before)
-                    end = min(len(lines), idx + after + 1)
-                    snippet_lines = []
-                    snippet_lines.append("=" * 80)
-                    rel_path = os.path.relpath(path, root_folder)
-                    snippet_lines.append(f"{rel_path} (line {idx+1}):")
-                    for i in range(start, end):
-                        prefix = ">>" if i == idx else "  "
-                        num = str(i + 1).rjust(4)
-                        snippet_lines.append(f"{prefix} {num}: {lines[i].rstrip()}")
-                    snippet_lines.append("")
-                    snippets.append("\n".join(snippet_lines))
-    return snippets
+    blocks, total = [], 0
+    scan = partial(_scan_one, root_folder=root_folder, regex=regex, before=before, after=after)
+    with ThreadPoolExecutor(max_workers=_IO_WORKERS) as ex:
+        # map() keeps results in walk order, same as the sequential scan
+        for n, block in ex.map(scan, paths):
+            if n:
+                blocks.append(block)
+                total += n
+    return "\n\n".join(blocks), total
 
 
 # --------- Drop mode path parsing (from your CLI) ----------
@@ -185,7 +416,7 @@ def _normalize_dropped_path(p):
 
     if parsed and parsed.scheme == "file":
         p = unquote(parsed.path or "")
-        if os.name == "nt" and re.match(r"^/[A-Za-z]:", p):
+        if os.name == "nt" and len(p) >= 3 and p[0] == "/" and p[1].isascii() and p[1].isalpha() and p[2] == ":":  # "/C:..."
             p = p.lstrip("/")
     else:
         p = unquote(p)
@@ -214,6 +445,12 @@ class ClipboarderGUI(BaseTk):
         self.geometry("980x680")
         self.minsize(880, 560)
 
+        # Same paths as the Mode 3 listbox, for O(1) duplicate checks
+        self._tab3_paths = set()
+        # (callable, args) posted by worker threads, run on the Tk thread
+        self._ui_queue = queue.Queue()
+        self.after(100, self._drain_ui_queue)
+
         self._build_menu()
 
         nb = ttk.Notebook(self)
@@ -231,7 +468,8 @@ class ClipboarderGUI(BaseTk):
         self._build_tab2()
         self._build_tab3()
 
-        if get_tokenizer() is None:
+        self._tokenizer = get_tokenizer()
+        if self._tokenizer is None:
             self.after(200, lambda: messagebox.showinfo(
                 "Info",
                 "Optional: Install 'tiktoken' for token-based chunking.\n\npip install tiktoken"
@@ -352,18 +590,21 @@ class ClipboarderGUI(BaseTk):
             messagebox.showwarning("No selections", "Add at least one folder + extension pair.")
             return
 
+        max_tokens = self._parse_int_entry(self.tab1_tokens)
         self._set_status(self.tab1_status, "Scanning folders...\n")
+        self._run_in_background(self._tab1_work, pairs, self.tab1_strip_var.get(), max_tokens)
+
+    def _tab1_work(self, pairs, strip, max_tokens):
+        """Worker thread: collect, combine and chunk; hands the chunks to _tab1_copy."""
         files = collect_files(pairs)
-        self._append_status(self.tab1_status, f"Found {len(files)} files.\n")
+        self._post(self._append_status, self.tab1_status, f"Found {len(files)} files.\n")
         if not files:
             return
 
-        combined = combine_files_with_annotations(files)
-        if self.tab1_strip_var.get():
-            combined = strip_empty_lines(combined)
+        combined = combine_files_with_annotations(files, strip=strip)
+        self._post(self._tab1_copy, self._split_in_background(combined, max_tokens))
 
-        max_tokens = self._parse_int_entry(self.tab1_tokens)
-        chunks = split_text_by_tokens(combined, max_tokens)
+    def _tab1_copy(self, chunks):
         if len(chunks) == 1:
             copy_to_clipboard(chunks[0], self)
             self._append_status(self.tab1_status, "Copied everything in one chunk to clipboard.\n")
@@ -443,40 +684,49 @@ class ClipboarderGUI(BaseTk):
             messagebox.showerror("Invalid Context", "Before/After must be integers.")
             return
 
+        max_tokens = self._parse_int_entry(self.tab2_tokens)
         self.tab2_status.set("Searching… this may take a moment.")
-        self.update_idletasks()
+        self._run_in_background(self._tab2_work, root, pattern, before, after, max_tokens)
 
+    def _tab2_work(self, root, pattern, before, after, max_tokens):
+        """Worker thread: search and chunk; hands the result to _tab2_copy."""
         try:
-            snippets = find_references_with_context(root, pattern, before=before, after=after)
+            combined, count = find_references_with_context(root, pattern, before=before, after=after)
         except ValueError as e:
-            messagebox.showerror("Regex Error", str(e))
-            self.tab2_status.set("")
+            self._post(messagebox.showerror, "Regex Error", str(e))
+            self._post(self.tab2_status.set, "")
             return
 
-        if not snippets:
-            self.tab2_status.set("No references found for that pattern.")
-            self._set_text(self.tab2_preview, "")
+        if not count:
+            self._post(self.tab2_status.set, "No references found for that pattern.")
+            self._post(self._set_text, self.tab2_preview, "")
             return
 
-        combined = "\n\n".join(snippets)
-        # preview: first 50 lines
-        preview = "\n".join(combined.splitlines()[:50])
-        if len(combined.splitlines()) > 50:
+        # preview: first 50 lines (maxsplit stops after them; the 51st part
+        # is the unsplit rest, empty when nothing follows)
+        head = combined.split("\n", 50)
+        if len(head) > 50:
+            rest = head.pop()
+        else:
+            rest = ""
+            if not head[-1]:
+                head.pop()  # the text's final newline does not start a line
+        preview = "\n".join(head)
+        if rest:
             preview += "\n… (truncated in preview)"
-        self._set_text(self.tab2_preview, preview)
-
-        max_tokens = self._parse_int_entry(self.tab2_tokens)
-        chunks = split_text_by_tokens(combined, max_tokens)
+        self._post(self._tab2_copy, preview, count, self._split_in_background(combined, max_tokens))
 
+    def _tab2_copy(self, preview, count, chunks):
+        self._set_text(self.tab2_preview, preview)
         if len(chunks) == 1:
             copy_to_clipboard(chunks[0], self)
-            self.tab2_status.set(f"Copied {len(snippets)} snippet block(s) to clipboard.")
+            self.tab2_status.set(f"Copied {count} snippet block(s) to clipboard.")
         else:
             for idx, ch in enumerate(chunks, 1):
                 copy_to_clipboard(ch, self)
                 if idx != len(chunks):
                     messagebox.showinfo("Chunk copied", f"Chunk {idx}/{len(chunks)} copied.\nPaste it, then click OK for the next chunk.")
-            self.tab2_status.set(f"Copied {len(snippets)} snippet block(s) to clipboard in {len(chunks)} chunks.")
+            self.tab2_status.set(f"Copied {count} snippet block(s) to clipboard in {len(chunks)} chunks.")
 
     # ------------------ Tab 3 ------------------
     def _build_tab3(self):
@@ -524,56 +774,41 @@ class ClipboarderGUI(BaseTk):
         self._set_readonly(self.tab3_status)
 
     def _tab3_on_drop(self, event):
-        raw = event.data  # may be a brace-quoted TCL list on some platforms
-        # Convert possible TCL-style list into space-separated
-        if raw.startswith("{") and raw.endswith("}"):
-            # naive split respecting braces
-            items = []
-            current = []
-            brace = 0
-            token = ""
-            for ch in raw:
-                if ch == "{":
-                    brace += 1
-                    if brace == 1:
-                        continue
-                elif ch == "}":
-                    brace -= 1
-                    if brace == 0:
-                        items.append("".join(current))
-                        current = []
-                        continue
-                if brace > 0:
-                    current.append(ch)
-                elif ch == " ":
-                    pass
-            paths = items
-        else:
-            paths = raw.split()
+        # event.data is a Tcl list (paths with spaces come brace-quoted);
+        # let Tcl's own list parser split it
+        paths = self.tk.splitlist(event.data)
 
-        added = 0
+        new_paths = []
         for p in paths:
             norm = _normalize_dropped_path(p)
             if os.path.isfile(norm):
-                if norm not in self.tab3_list.get(0, "end"):
-                    self.tab3_list.insert("end", norm)
-                    added += 1
-        self._set_status(self.tab3_status, f"Added {added} file(s) via drag-and-drop.\n")
+                if norm not in self._tab3_paths:
+                    self._tab3_paths.add(norm)
+                    new_paths.append(norm)
+        if new_paths:
+            self.tab3_list.insert("end", *new_paths)  # one Tcl call for the whole drop
+        self._set_status(self.tab3_status, f"Added {len(new_paths)} file(s) via drag-and-drop.\n")
 
     def _tab3_add_files(self):
         files = filedialog.askopenfilenames(title="Choose files")
+        new_paths = []
         for f in files:
-            if f not in self.tab3_list.get(0, "end"):
-                self.tab3_list.insert("end", f)
+            if f not in self._tab3_paths:
+                self._tab3_paths.add(f)
+                new_paths.append(f)
+        if new_paths:
+            self.tab3_list.insert("end", *new_paths)
 
     def _tab3_remove_selected(self):
         sel = list(self.tab3_list.curselection())
         sel.reverse()
         for i in sel:
+            self._tab3_paths.discard(self.tab3_list.get(i))
             self.tab3_list.delete(i)
 
     def _tab3_clear(self):
         self.tab3_list.delete(0, "end")
+        self._tab3_paths.clear()
 
     def _tab3_run(self):
         files = list(self.tab3_list.get(0, "end"))
@@ -581,13 +816,15 @@ class ClipboarderGUI(BaseTk):
             messagebox.showwarning("No Files", "Add some files first.")
             return
         self._set_status(self.tab3_status, f"Found {len(files)} staged file(s).\n")
+        max_tokens = self._parse_int_entry(self.tab3_tokens)
+        self._run_in_background(self._tab3_work, files, self.tab3_strip_var.get(), max_tokens)
 
-        combined = combine_files_with_annotations(files)
-        if self.tab3_strip_var.get():
-            combined = strip_empty_lines(combined)
+    def _tab3_work(self, files, strip, max_tokens):
+        """Worker thread: combine and chunk; hands the chunks to _tab3_copy."""
+        combined = combine_files_with_annotations(files, strip=strip)
+        self._post(self._tab3_copy, self._split_in_background(combined, max_tokens))
 
-        max_tokens = self._parse_int_entry(self.tab3_tokens)
-        chunks = split_text_by_tokens(combined, max_tokens)
+    def _tab3_copy(self, chunks):
         if len(chunks) == 1:
             copy_to_clipboard(chunks[0], self)
             self._append_status(self.tab3_status, "Copied all content in one go.\n")
@@ -599,6 +836,40 @@ class ClipboarderGUI(BaseTk):
                     messagebox.showinfo("Chunk copied", f"Chunk {idx}/{len(chunks)} copied.\nPaste it, then click OK for the next chunk.")
             self._append_status(self.tab3_status, "All chunks copied.\n")
 
+    # ------------------ Background work ------------------
+    def _run_in_background(self, work, *args):
+        """Run work(*args) on a daemon thread so the window keeps repainting.
+        Workers must not touch widgets; they report back through _post()."""
+        threading.Thread(target=self._guarded, args=(work, args), daemon=True).start()
+
+    def _guarded(self, work, args):
+        try:
+            work(*args)
+        except Exception as e:
+            self._post(messagebox.showerror, "Error", str(e))
+
+    def _post(self, fn, *args):
+        """Queue fn(*args) to run on the Tk thread."""
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self):
+        try:
+            while True:
+                fn, args = self._ui_queue.get_nowait()
+                fn(*args)
+        except queue.Empty:
+            pass
+        finally:
+            self.after(100, self._drain_ui_queue)
+
+    def _split_in_background(self, text, max_tokens):
+        """split_text_by_tokens for worker threads: the missing-tiktoken
+        dialog is posted to the Tk thread instead of shown directly."""
+        if max_tokens and self._tokenizer is None:
+            self._post(_warn_no_tokenizer)
+            return [text]
+        return split_text_by_tokens(text, max_tokens, tok=self._tokenizer)
+
     # ------------------ Utilities ------------------
     def _parse_int_entry(self, entry: ttk.Entry):
         raw = entry.get().strip()
@@ -3,7 +3,7 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from utils import combine_files_with_annotations, strip_empty_lines, split_text_by_tokens, copy_to_clipboard
+from utils import combine_files_with_annotations, strip_empty_lines, split_text_by_tokens, copy_to_clipboard, copy_chunks
 
 class DropCompileTab(ttk.Frame):
     def __init__(self, master, themed_text_kwargs, tkdnd_enabled=False, dnd_files=None):
@@ -11,6 +11,7 @@ class DropCompileTab(ttk.Frame):
         self._themed_text_kwargs = dict(themed_text_kwargs)  # for Text widgets
         self.tkdnd_enabled = tkdnd_enabled
         self.dnd_files = dnd_files
+        self._path_set = set()  # same paths as the listbox, for O(1) dedup
 
         info = ttk.LabelFrame(self, text="Instructions")
         info.pack(fill="x", padx=4, pady=6)
@@ -68,7 +69,8 @@ class DropCompileTab(ttk.Frame):
         paths = self.tk.splitlist(raw)
         added = 0
         for p in paths:
-            if os.path.isfile(p) and p not in self.listbox.get(0, "end"):
+            if os.path.isfile(p) and p not in self._path_set:
+                self._path_set.add(p)
                 self.listbox.insert("end", p)
                 added += 1
         self._set_status(f"Added {added} file(s) via drag-and-drop.\n")
@@ -76,17 +78,20 @@ class DropCompileTab(ttk.Frame):
     def _add_files(self):
         files = filedialog.askopenfilenames(title="Choose files")
         for f in files:
-            if f not in self.listbox.get(0, "end"):
+            if f not in self._path_set:
+                self._path_set.add(f)
                 self.listbox.insert("end", f)
 
     def _remove_selected(self):
         sel = list(self.listbox.curselection())
         sel.reverse()
         for i in sel:
+            self._path_set.discard(self.listbox.get(i))
             self.listbox.delete(i)
 
     def _clear(self):
         self.listbox.delete(0, "end")
+        self._path_set.clear()
 
     def _run(self):
         files = list(self.listbox.get(0, "end"))
@@ -105,12 +110,9 @@ class DropCompileTab(ttk.Frame):
             copy_to_clipboard(chunks[0], self)
             self._append_status("Copied all content in one go.\n")
         else:
-            for idx, ch in enumerate(chunks, 1):
-                copy_to_clipboard(ch, self)
-                self._append_status(f"Copied chunk {idx}/{len(chunks)}. Paste now, then press OK.\n")
-                if idx != len(chunks):
-                    messagebox.showinfo("Chunk copied", f"Chunk {idx}/{len(chunks)} copied.\nPaste it, then click OK for the next chunk.")
-            self._append_status("All chunks copied.\n")
+            copy_chunks(chunks, self,
+                        on_copied=lambda i, n: self._append_status(f"Copied chunk {i}/{n}. Paste now, then press OK.\n"),
+                        on_done=lambda: self._append_status("All chunks copied.\n"))
 
     # utilities
     def _parse_int_entry(self, entry: ttk.Entry):
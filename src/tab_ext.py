@@ -3,7 +3,7 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from utils import collect_files, combine_files_with_annotations, strip_empty_lines, split_text_by_tokens, copy_to_clipboard
+from utils import collect_files, combine_files_with_annotations, strip_empty_lines, split_text_by_tokens, copy_to_clipboard, copy_chunks
 
 class ScanByExtensionTab(ttk.Frame):
     def __init__(self, master, themed_text_kwargs):
@@ -73,8 +73,7 @@ class ScanByExtensionTab(ttk.Frame):
 
     def _run(self):
         pairs = []
-        for i in range(self.listbox.size()):
-            item = self.listbox.get(i)
+        for item in self.listbox.get(0, "end"):  # one Tk call for all rows
             if "||" in item:
                 folder, ext = [s.strip() for s in item.split("||", 1)]
                 if os.path.isdir(folder) and ext:
@@ -99,13 +98,9 @@ class ScanByExtensionTab(ttk.Frame):
             copy_to_clipboard(chunks[0], self)
             self._append_status("Copied everything in one chunk to clipboard.\n")
         else:
-            for idx, ch in enumerate(chunks, 1):
-                copy_to_clipboard(ch, self)
-                self._append_status(f"Copied chunk {idx}/{len(chunks)}. Paste now, then press OK.\n")
-                if idx != len(chunks):
-                    from tkinter import messagebox as mb
-                    mb.showinfo("Chunk copied", f"Chunk {idx}/{len(chunks)} copied.\nPaste it, then click OK for the next chunk.")
-            self._append_status("All chunks copied.\n")
+            copy_chunks(chunks, self,
+                        on_copied=lambda i, n: self._append_status(f"Copied chunk {i}/{n}. Paste now, then press OK.\n"),
+                        on_done=lambda: self._append_status("All chunks copied.\n"))
 
     def _parse_int_entry(self, entry: ttk.Entry):
         raw = entry.get().strip()
@@ -3,7 +3,7 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from utils import guess_csharp_regex_from_text, find_cs_references_with_context, split_text_by_tokens, copy_to_clipboard
+from utils import guess_csharp_regex_from_text, iter_cs_references, stream_chunks, copy_to_clipboard, copy_chunks
 
 class FindCsRefsTab(ttk.Frame):
     def __init__(self, master, themed_text_kwargs):
@@ -22,7 +22,8 @@ class FindCsRefsTab(ttk.Frame):
         ttk.Label(r2, text="Search text:").pack(side="left")
         self.user_text = ttk.Entry(r2)
         self.user_text.pack(side="left", fill="x", expand=True, padx=6)
-        self.user_text.bind("<KeyRelease>", lambda e: self._auto_update_regex())
+        self.user_text.bind("<KeyRelease>", lambda e: self._schedule_regex_update())
+        self._regex_job = None
 
         r3 = ttk.Frame(top); r3.pack(fill="x", padx=6, pady=4)
         ttk.Label(r3, text="Generated regex:").pack(side="left")
@@ -35,9 +36,10 @@ class FindCsRefsTab(ttk.Frame):
         self.before.delete(0, "end"); self.before.insert(0, "3")
         self.before.pack(side="left", padx=(6, 12))
         ttk.Label(r4, text="Lines after:").pack(side="left")
-        self.after = ttk.Spinbox(r4, from_=0, to=50, width=5)
-        self.after.delete(0, "end"); self.after.insert(0, "3")
-        self.after.pack(side="left", padx=(6, 12))
+        # not self.after: that would shadow Misc.after, which copy_chunks schedules with
+        self.after_spin = ttk.Spinbox(r4, from_=0, to=50, width=5)
+        self.after_spin.delete(0, "end"); self.after_spin.insert(0, "3")
+        self.after_spin.pack(side="left", padx=(6, 12))
 
         r5 = ttk.Frame(top); r5.pack(fill="x", padx=6, pady=4)
         ttk.Label(r5, text="Max tokens per chunk (blank = no chunking):").pack(side="left")
@@ -68,7 +70,14 @@ class FindCsRefsTab(ttk.Frame):
             self.root_entry.delete(0, "end")
             self.root_entry.insert(0, folder)
 
+    def _schedule_regex_update(self):
+        # Debounce typing: coalesce keystrokes into one update 50 ms after the last
+        if self._regex_job is not None:
+            self.after_cancel(self._regex_job)
+        self._regex_job = self.after(50, self._auto_update_regex)
+
     def _auto_update_regex(self):
+        self._regex_job = None
         text = (self.user_text.get() or "").strip()
         regex = guess_csharp_regex_from_text(text)
         self.regex_entry.delete(0, "end")
@@ -80,6 +89,9 @@ class FindCsRefsTab(ttk.Frame):
             messagebox.showerror("Invalid Folder", "Root folder is not a directory.")
             return
 
+        if self._regex_job is not None:  # keystroke still pending: apply it first
+            self.after_cancel(self._regex_job)
+            self._auto_update_regex()
         pattern = (self.regex_entry.get() or "").strip()
         if not pattern:
             # last-ditch: generate from user text now
@@ -89,45 +101,57 @@ class FindCsRefsTab(ttk.Frame):
                 return
 
         try:
-            before = int(self.before.get()); after = int(self.after.get())
+            before = int(self.before.get()); after = int(self.after_spin.get())
         except ValueError:
             messagebox.showerror("Invalid Context", "Before/After must be integers.")
             return
 
+        raw = self.tokens.get().strip()
+        max_tokens = int(raw) if raw.isdigit() and int(raw) > 0 else None
+
         self.status.set("Searching… this may take a moment.")
         self.update_idletasks()
 
         try:
-            snippets = find_cs_references_with_context(root, pattern, before=before, after=after)
+            hits = iter_cs_references(root, pattern, before=before, after=after)
         except ValueError as e:
             messagebox.showerror("Regex Error", str(e))
             self.status.set("")
             return
 
-        if not snippets:
+        # Chunk while the search streams in: per-file blocks go straight to
+        # the packer, so the full result text is never built on its own
+        count = 0
+        def fragments():
+            nonlocal count
+            for i, (n, text) in enumerate(hits):
+                count += n
+                yield "\n\n" + text if i else text
+        chunks = list(stream_chunks(fragments(), max_tokens))
+
+        if not count:
             self.status.set("No references found for that pattern.")
             self._set_text(self.preview, "")
             return
 
-        combined = "\n\n".join(snippets)
-        preview = "\n".join(combined.splitlines()[:50])
-        if len(combined.splitlines()) > 50:
+        head, newlines = [], 0
+        for chunk in chunks:  # just enough leading chunks to cover 50 lines
+            head.append(chunk)
+            newlines += chunk.count("\n")
+            if newlines > 50:
+                break
+        lines = "".join(head).splitlines()
+        preview = "\n".join(lines[:50])
+        if len(lines) > 50:
             preview += "\n… (truncated in preview)"
         self._set_text(self.preview, preview)
 
-        # Chunk & copy
-        raw = self.tokens.get().strip()
-        max_tokens = int(raw) if raw.isdigit() and int(raw) > 0 else None
-        chunks = split_text_by_tokens(combined, max_tokens)
         if len(chunks) == 1:
             copy_to_clipboard(chunks[0], self)
-            self.status.set(f"Copied {len(snippets)} snippet block(s) to clipboard.")
+            self.status.set(f"Copied {count} snippet block(s) to clipboard.")
         else:
-            for idx, ch in enumerate(chunks, 1):
-                copy_to_clipboard(ch, self)
-                if idx != len(chunks):
-                    messagebox.showinfo("Chunk copied", f"Chunk {idx}/{len(chunks)} copied.\nPaste it, then click OK for the next chunk.")
-            self.status.set(f"Copied {len(snippets)} snippet block(s) to clipboard in {len(chunks)} chunks.")
+            copy_chunks(chunks, self,
+                        on_done=lambda: self.status.set(f"Copied {count} snippet block(s) to clipboard in {len(chunks)} chunks."))
 
     # text helpers
     def _set_readonly(self, text_widget: tk.Text):
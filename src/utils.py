@@ -1,38 +1,93 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: MIT
-import os, re, shlex
+import os, re, shlex, mmap, shutil, subprocess, sys, threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import accumulate, chain, islice
 from urllib.parse import urlparse, unquote
 
 # -------- Optional deps (lazy) --------
 try:
-    import pyperclip
+    import re2  # pip install google-re2: linear-time matching for the C# search
 except Exception:
-    pyperclip = None
+    re2 = None
+try:
+    import win32clipboard  # pip install pywin32: direct CF_UNICODETEXT for big copies on Windows
+except Exception:
+    win32clipboard = None
 
 _TOKENIZER_SENTINEL = object()
 TOKENIZER = _TOKENIZER_SENTINEL
+_TOKENIZER_LOCK = threading.Lock()  # the warm-up thread and a click may race
 
 def get_tokenizer():
     """Return a tiktoken encoder or None (never raises)."""
     global TOKENIZER
     if TOKENIZER is not _TOKENIZER_SENTINEL:
         return TOKENIZER
-    try:
-        import tiktoken
-        TOKENIZER = tiktoken.encoding_for_model("gpt-4o")
-    except Exception:
-        TOKENIZER = None
+    with _TOKENIZER_LOCK:
+        if TOKENIZER is _TOKENIZER_SENTINEL:
+            try:
+                import tiktoken
+                TOKENIZER = tiktoken.encoding_for_model("gpt-4o")
+            except Exception:
+                TOKENIZER = None
     return TOKENIZER
 
+def warm_tokenizer() -> threading.Thread:
+    """Load the tokenizer on a daemon thread, so the first chunked copy
+    finds it ready instead of stalling on the import and BPE tables.
+    Returns the (started) thread."""
+    t = threading.Thread(target=get_tokenizer, name="tokenizer-warmup", daemon=True)
+    t.start()
+    return t
+
 # ---------- Clipboard ----------
+_LARGE_CLIPBOARD = 1 << 20  # characters; anything smaller Tk copies quickly enough
+
+def _native_clipboard_cmd():
+    # Helper that takes the text on stdin, for the session actually running
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-copy"):
+        return ["wl-copy"]
+    if os.environ.get("DISPLAY"):
+        if shutil.which("xclip"):
+            return ["xclip", "-selection", "clipboard"]
+        if shutil.which("xsel"):
+            return ["xsel", "--clipboard", "--input"]
+    return None
+
+def _copy_native(text: str) -> bool:
+    # One write to the OS clipboard, skipping Tk's conversion to a Tcl string
+    # and its slow selection handoff; False if this platform has no such path
+    if win32clipboard is not None:
+        win32clipboard.OpenClipboard()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(win32clipboard.CF_UNICODETEXT, text)
+        finally:
+            win32clipboard.CloseClipboard()
+        return True
+    cmd = _native_clipboard_cmd() if sys.platform.startswith("linux") else None
+    if cmd is None:
+        return False
+    # The helper forks to serve the selection; no pipes on stdout/stderr, or
+    # waiting for it would block on the child holding them open
+    subprocess.run(cmd, input=text.encode("utf-8", "surrogatepass"), stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, check=True, timeout=30)
+    return True
+
 def copy_to_clipboard(text: str, tk_root) -> None:
-    """Copy text via pyperclip if available, else via Tk."""
-    if pyperclip is not None:
+    """Copy text via Tk's own clipboard (in-process). Multi-MB text goes
+    straight to the OS clipboard instead when possible (pywin32 on Windows,
+    wl-copy/xclip/xsel on Linux)."""
+    if len(text) >= _LARGE_CLIPBOARD:
         try:
-            pyperclip.copy(text)
-            return
+            if _copy_native(text):
+                return
         except Exception:
-            pass
+            pass  # fall back to Tk
     try:
         tk_root.clipboard_clear()
         tk_root.clipboard_append(text)
@@ -41,54 +96,215 @@ def copy_to_clipboard(text: str, tk_root) -> None:
         from tkinter import messagebox
         messagebox.showerror("Clipboard Error", f"Failed to copy to clipboard:\n{e}")
 
+def copy_chunks(chunks, tk_root, on_copied=None, on_done=None) -> None:
+    """
+    Copy chunks one at a time, with an OK dialog in between. Each step is
+    scheduled via tk_root.after, so the event loop runs between chunks
+    instead of the whole sequence blocking inside one handler.
+    on_copied(idx, total) runs after each copy, on_done() after the last.
+    """
+    from tkinter import messagebox
+    total = len(chunks)
+
+    def step(idx):
+        copy_to_clipboard(chunks[idx - 1], tk_root)
+        if on_copied:
+            on_copied(idx, total)
+        if idx < total:
+            messagebox.showinfo("Chunk copied", f"Chunk {idx}/{total} copied.\nPaste it, then click OK for the next chunk.")
+            tk_root.after(0, step, idx + 1)
+        elif on_done:
+            on_done()
+
+    if total:
+        tk_root.after(0, step, 1)
+
 # ---------- Chunking / text utils ----------
-def split_text_by_tokens(text: str, max_tokens: int):
+def _ends_line(line):
+    # splitlines() ended `line` for good: a lone "\r" may still become "\r\n"
+    return line.splitlines()[0] != line and not line.endswith("\r")
+
+def stream_chunks(fragments, max_tokens):
+    """Yield the chunks split_text_by_tokens("".join(fragments)) would make,
+    each as soon as it is full, holding only the chunk being built."""
+    fragments = iter(fragments)
     if not max_tokens or max_tokens <= 0:
-        return [text]
+        yield "".join(fragments)
+        return
+    # A token spans at least one UTF-8 byte: hold fragments back while they
+    # fit the budget in bytes, and if the stream ends first it is a single
+    # chunk without loading tiktoken at all
+    head, size = [], 0
+    for fragment in fragments:
+        head.append(fragment)
+        size += len(fragment) if fragment.isascii() else len(fragment.encode("utf-8", "surrogatepass"))
+        if size > max_tokens:
+            break
+    else:
+        if size:
+            yield "".join(head)
+            return
+    fragments = chain(head, fragments)
     tok = get_tokenizer()
     if tok is None:
-        return [text]
-    lines = text.splitlines(keepends=True)
-    chunks, current = [], ""
-    for line in lines:
-        if len(tok.encode(current + line)) <= max_tokens:
-            current += line
-        else:
-            if current:
-                chunks.append(current)
-            if len(tok.encode(line)) > max_tokens:
-                chunks.append(line)
-                current = ""
-            else:
-                current = line
-    if current:
-        chunks.append(current)
-    return chunks
+        yield "".join(fragments)
+        return
+
+    encode = tok.encode_ordinary
+    cur, current_tokens = [], 0
+
+    def pack(lines):
+        # Encode line by line (encode_ordinary_batch starts a thread pool per
+        # call and is slower on many short lines), then pack greedily over
+        # prefix sums of the per-line counts: lines[i:j] fit in what is left
+        # iff sums[j] - sums[i] <= room, so each chunk's last line is one
+        # bisect away, not a loop per line
+        nonlocal cur, current_tokens
+        sums = [0, *accumulate(len(encode(line)) for line in lines)]
+        i = 0
+        while i < len(lines):
+            j = bisect_right(sums, sums[i] + max_tokens - current_tokens, i) - 1
+            if j > i:
+                cur += lines[i:j]
+                current_tokens += sums[j] - sums[i]
+                i = j
+                if i == len(lines):
+                    break
+            # lines[i] does not fit with the current chunk
+            if cur:
+                yield "".join(cur)
+            cur, current_tokens = [], 0
+            if sums[i + 1] - sums[i] > max_tokens:
+                yield lines[i]  # a single line over budget goes alone
+                i += 1
+
+    carry = ""  # a line split across two fragments is counted once, whole
+    for fragment in fragments:
+        lines = (carry + fragment).splitlines(keepends=True)
+        carry = lines.pop() if lines and not _ends_line(lines[-1]) else ""
+        yield from pack(lines)
+    if carry:
+        yield from pack([carry])
+    if cur:
+        yield "".join(cur)
+
+def split_text_by_tokens(text: str, max_tokens: int):
+    return list(stream_chunks([text], max_tokens))
+
+# Line boundaries str.splitlines() knows besides "\n"
+_ODD_BREAKS = "\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_BLANK_RUN_RE = re.compile(r"\n\s*\n")  # \s is exactly what str.strip() drops
+_LEADING_BLANK_RE = re.compile(r"\s*\n")
 
 def strip_empty_lines(text: str) -> str:
-    return "\n".join(line for line in text.splitlines() if line.strip())
+    if any(c in text for c in _ODD_BREAKS):  # rare: let splitlines() sort them out
+        return "\n".join(line for line in text.splitlines() if line.strip())
+    # Only "\n" breaks: collapse every run of blank lines in one C pass, then trim the ends
+    text = _BLANK_RUN_RE.sub("\n", text)
+    m = _LEADING_BLANK_RE.match(text)
+    if m:
+        text = text[m.end():]
+    i = text.rfind("\n")
+    if not text[i + 1:].strip():  # blank (or empty) last line
+        text = text[:max(i, 0)]
+    return text
+
+_READ_CACHE = OrderedDict()  # path -> (mtime_ns, size, text), least recently used first
+_READ_CACHE_MAX_BYTES = 64 << 20  # total size of the files kept
+_read_cache_bytes = 0
+_READ_CACHE_LOCK = threading.Lock()  # reads run on a thread pool
+
+def _read_cached(path, mtime_ns, size):
+    # One entry per path: an edited file (new mtime/size) replaces its old
+    # text instead of sitting beside it, and the least recently used files
+    # are dropped once the cache holds more than _READ_CACHE_MAX_BYTES
+    global _read_cache_bytes
+    with _READ_CACHE_LOCK:
+        hit = _READ_CACHE.get(path)
+        if hit is not None and hit[0] == mtime_ns and hit[1] == size:
+            _READ_CACHE.move_to_end(path)
+            return hit[2]
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    if size > _READ_CACHE_MAX_BYTES:
+        return text
+    with _READ_CACHE_LOCK:
+        old = _READ_CACHE.pop(path, None)
+        if old is not None:
+            _read_cache_bytes -= old[1]
+        _READ_CACHE[path] = (mtime_ns, size, text)
+        _read_cache_bytes += size
+        while _read_cache_bytes > _READ_CACHE_MAX_BYTES:
+            _read_cache_bytes -= _READ_CACHE.popitem(last=False)[1][1]
+    return text
+
+def _read_one(path):
+    """One annotated section (or the read warning) for combine_files_with_annotations."""
+    try:
+        st = os.stat(path)
+        content = _read_cached(path, st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        return (f"# ===== File: {os.path.basename(path)} =====\n"
+                f"[Warning: Could not read '{path}': {e}]")
+    return f"# ===== File: {os.path.basename(path)} =====\n{content}"
 
 def combine_files_with_annotations(file_paths):
-    sections = []
-    for path in file_paths:
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-        except Exception as e:
-            sections.append(f"# ===== File: {os.path.basename(path)} =====\n"
-                            f"[Warning: Could not read '{path}': {e}]")
-            continue
-        sections.append(f"# ===== File: {os.path.basename(path)} =====\n{content}")
-    return "\n\n".join(sections)
+    if not file_paths:
+        return ""
+    # Reads are I/O-bound (the GIL is released); map() keeps the input order
+    with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as ex:
+        return "\n\n".join(ex.map(_read_one, file_paths))
+
+def _scan_tree(folder, ext):
+    # Iterative os.scandir walk: entry types come from the directory read
+    # itself, and an explicit stack of open iterators replaces a chain of
+    # nested generators. `ext` may be a tuple of suffixes (str.endswith).
+    # Like os.walk, unreadable folders are skipped and dir symlinks not followed.
+    try:
+        stack = [os.scandir(folder)]
+    except OSError:
+        return
+    try:
+        while stack:
+            try:
+                e = next(stack[-1])
+            except StopIteration:
+                stack.pop().close()
+                continue
+            except OSError:
+                stack.pop().close()
+                continue
+            try:
+                is_dir = e.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not e.is_symlink():
+                    try:
+                        stack.append(os.scandir(e.path))
+                    except OSError:
+                        pass
+            elif e.name.endswith(ext):
+                yield e.path
+    finally:
+        for it in stack:
+            it.close()
+
+def _walk_one(pair):
+    folder, exts = pair
+    return list(_scan_tree(folder, exts))
 
 def collect_files(folder_ext_pairs):
-    all_files = []
+    # Each folder is walked once, matching all of its extensions in one endswith()
+    by_folder = {}
     for folder, ext in folder_ext_pairs:
-        for root, _, files in os.walk(folder):
-            for fname in files:
-                if fname.endswith(ext):
-                    all_files.append(os.path.join(root, fname))
-    return sorted(all_files)
+        by_folder.setdefault(folder, []).append(ext)
+    if not by_folder:
+        return []
+    # One walk per folder, concurrently: directory listing is syscall-bound
+    with ThreadPoolExecutor(max_workers=min(32, len(by_folder))) as ex:
+        return sorted(chain.from_iterable(
+            ex.map(_walk_one, [(f, tuple(exts)) for f, exts in by_folder.items()])))
 
 # ---------- DnD path parsing ----------
 def _normalize_dropped_path(p):
@@ -99,8 +315,7 @@ def _normalize_dropped_path(p):
         parsed = None
     if parsed and parsed.scheme == "file":
         p = unquote(parsed.path or "")
-        import os as _os, re as _re
-        if _os.name == "nt" and _re.match(r"^/[A-Za-z]:", p):
+        if os.name == "nt" and len(p) >= 3 and p[0] == "/" and p[1].isascii() and p[1].isalpha() and p[2] == ":":  # "/C:..."
             p = p.lstrip("/")
     else:
         p = unquote(p)
@@ -119,6 +334,7 @@ def parse_dropped_input(line: str):
 # ---------- Regex helpers ----------
 _IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
+@lru_cache(maxsize=512)  # pure; called on every keystroke in the refs tab
 def guess_csharp_regex_from_text(user_text: str) -> str:
     """
     Build a practical regex for C# based on simple user text:
@@ -163,38 +379,344 @@ def guess_csharp_regex_from_text(user_text: str) -> str:
     # fallback literal
     return re.escape(s)
 
-def find_cs_references_with_context(root_folder, pattern, before=3, after=3):
+_CS_SUFFIXES = (".cs", ".CS", ".Cs", ".cS")
+_NEWLINE_RE = re.compile(b"\n")
+_NEWLINE_TEXT_RE = re.compile("\n")
+# Escapes that mean something else (or nothing) in a bytes pattern; \x and
+# octal escapes are one byte there, not a code point
+_UNICODE_ESCAPES = "bBwWsSdDuUNx0123456789"
+# One UTF-8 encoded non-ASCII character
+_MULTIBYTE = rb"[\xc0-\xff][\x80-\xbf]*"
+# Atomic groups, possessive repeats, negative lookaround: widening their
+# contents can make the whole pattern match less
+_NARROWING_RE = re.compile(r"\(\?>|\(\?<?!|[*+?}]\+")
+_MMAP_MIN_BYTES = 1024 * 1024  # smaller files are simply read
+_SEARCH_WORKERS = os.cpu_count() or 1
+_SEARCH_AHEAD = 2 * _SEARCH_WORKERS
+
+def _crlf_dollar(pattern):
+    # Raw bytes keep CRLF endings, so each '$' anchor (unescaped, outside a
+    # character class) becomes \r?$; only a match's start is used
+    if "$" not in pattern:
+        return pattern
+    out = []
+    in_class = False
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            j = i + 1
+            if pattern.startswith("^", j):
+                j += 1
+            if pattern.startswith("]", j):
+                j += 1  # a leading ']' is literal
+            out.append(pattern[i:j])
+            i = j
+            continue
+        elif c == "$":
+            c = r"\r?$"
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+def _needs_text(pattern):
+    # False only if the pattern compiled as bytes matches exactly where the
+    # str one would. On str, \b \w \s \d (and negations) and IGNORECASE are
+    # Unicode-aware, but ASCII-only on bytes (\bFoo\b would match in "éFoo");
+    # a non-ASCII pattern, or a '.' / '[^...]' that must match exactly one
+    # character, would see a multi-byte character as several (with * or +
+    # after them the two agree). The u and L inline flags stay on str too,
+    # so they work (or fail) as before
+    if not pattern.isascii() or re.compile(pattern).flags & re.IGNORECASE:
+        return True
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                return True
+            i += 2
+            continue
+        if c == "(" and pattern.startswith("?", i + 1):
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                j += 1
+            if not set(pattern[i + 2:j]).isdisjoint("iuL"):
+                return True  # (?u), (?L) or a scoped (?i:...)
+        if c == "[":
+            negated = pattern.startswith("^", i + 1)
+            i += 2 if negated else 1
+            if pattern.startswith("]", i):
+                i += 1
+            while i < n and pattern[i] != "]":
+                if pattern[i] == "\\":
+                    if pattern[i + 1:i + 2] in _UNICODE_ESCAPES:
+                        return True
+                    i += 1
+                i += 1
+            if negated and pattern[i + 1:i + 2] not in ("*", "+"):
+                return True
+        elif c == "." and pattern[i + 1:i + 2] not in ("*", "+"):
+            return True
+        i += 1
+    return False
+
+def _widened(pattern):
+    # For a pattern _needs_text keeps on str: a bytes pattern matching in the
+    # UTF-8 wherever the str one matches the text, and in a few more places
+    # (\b/\B always hold; \w \s \d and negations, '.' and classes also
+    # take any one multi-byte character). It only finds candidate lines,
+    # which the str pattern then confirms. None if there is no such rewrite
+    if not pattern.isascii() or _NARROWING_RE.search(pattern):
+        return None
+    if re.compile(pattern).flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            e = pattern[i + 1:i + 2]
+            if e in ("b", "B"):
+                out.append(b"(?:)")
+            elif e and e in "wWsSdD":
+                out.append(_widened_set(pattern[i:i + 2], False, e,
+                                        pattern[i + 2:i + 3] in ("*", "+")))
+            elif e and e in _UNICODE_ESCAPES:
+                return None  # code points, backreferences
+            else:
+                out.append(pattern[i:i + 2].encode())
+            i += 2
+            continue
+        if c == "(" and pattern.startswith("?", i + 1):
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                j += 1
+            if not set(pattern[i + 2:j]).isdisjoint("iuL"):
+                return None
+        if c == "[":
+            j = i + 1
+            negated = pattern.startswith("^", j)
+            if negated:
+                j += 1
+            body_start = j
+            if pattern.startswith("]", j):
+                j += 1
+            wide = ""
+            while j < n and pattern[j] != "]":
+                if pattern[j] == "\\":
+                    e = pattern[j + 1:j + 2]
+                    if e and e in "wWsSdD":
+                        wide += e
+                    elif e and e in _UNICODE_ESCAPES and e not in ("b", "B"):
+                        return None
+                    j += 1
+                j += 1
+            repeated = pattern[j + 1:j + 2] in ("*", "+")
+            if wide or negated and not repeated:
+                out.append(_widened_set(pattern[body_start:j], negated, wide, repeated))
+            else:
+                out.append(pattern[i:j + 1].encode())
+            i = j + 1
+            continue
+        if c == "." and pattern[i + 1:i + 2] not in ("*", "+"):
+            out.append(b"(?:" + _MULTIBYTE + b"|.)")
+        else:
+            out.append(c.encode())
+        i += 1
+    return b"".join(out)
+
+def _widened_set(body, negated, wide, repeated):
+    # A class (body = inside the brackets) or \w-style escape, also taking a
+    # multi-byte character, plus \x1c-\x1f for \s/\S (space on str only).
+    # Under * or + the bytes of a character may be taken one by one
+    extra = rb"\x1c-\x1f" if set(wide) & {"s", "S"} else b""
+    body = body.encode()
+    if repeated:
+        if negated:
+            return b"(?:[^" + body + b"]|[" + extra + rb"\x80-\xff])"
+        return b"[" + body + extra + rb"\x80-\xff]"
+    if negated:
+        cls = b"[^" + body + b"]" + (b"|[" + extra + b"]" if extra else b"")
+    else:
+        cls = b"[" + body + extra + b"]"
+    return b"(?:" + _MULTIBYTE + b"|" + cls + b")"
+
+def _compile_cs_prefilter(pattern):
+    # The _widened() form of a str-only pattern, compiled like
+    # _compile_cs_pattern (RE2 first); None if there is none
+    source = _widened(_crlf_dollar(pattern))
+    if source is None:
+        return None
+    if re2 is not None:
+        try:
+            return re2.compile(b"(?m)" + source)
+        except Exception:
+            pass
+    try:
+        return re.compile(source, re.MULTILINE)
+    except re.error:
+        return None
+
+def _compile_cs_pattern(pattern, as_text):
+    # MULTILINE: ^/$ still anchor at each line when the whole file is searched.
+    # Unless as_text (see _needs_text), a bytes pattern runs on the file
+    # contents without decoding them. RE2 (if installed) cannot backtrack
+    # forever on a bad pattern; patterns it rejects (lookaround,
+    # backreferences) fall back to re.
+    source = _crlf_dollar(pattern)
+    if as_text:
+        return re.compile(source, re.MULTILINE)
+    source = source.encode("utf-8")
+    if re2 is not None:
+        try:
+            return re2.compile(b"(?m)" + source)
+        except Exception:
+            pass
+    return re.compile(source, re.MULTILINE)
+
+def _relpath_under(root_folder):
+    # os.path.relpath() normalizes both paths on every call; files share
+    # directories, so each directory is resolved once and the name appended
+    @lru_cache(maxsize=None)
+    def rel_dir(dirpath):
+        return os.path.relpath(dirpath, root_folder)
+
+    def relpath(path):
+        dirpath, name = os.path.split(path)
+        rel = rel_dir(dirpath)
+        return name if rel == os.curdir else rel + os.sep + name
+    return relpath
+
+def _search_file(regex, line_search, before, after, relpath, path):
+    # Large files are memory-mapped and searched in place (no full copy)
     try:
-        regex = re.compile(pattern)
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return 0, ""
+            if isinstance(regex.pattern, str):  # no bytes form: search the decoded text
+                return _search_buffer(regex, None, before, after, relpath, path,
+                                      f.read().decode("utf-8", "ignore"))
+            if size < _MMAP_MIN_BYTES:
+                return _search_buffer(regex, line_search, before, after, relpath, path, f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _search_buffer(regex, line_search, before, after, relpath, path, mm)
+    except (OSError, ValueError):
+        return 0, ""
+
+def _search_buffer(regex, line_search, before, after, relpath, path, data):
+    # The regex sweeps the whole file in C; a hit's lines are found by
+    # bisecting the newline offsets (collected only once the file matches).
+    # \s, [^x] and the like run across newlines, so a match may start on an
+    # earlier line than the one it is about (^\s*Foo begins on the blank line
+    # above Foo): each line it spans is only a candidate, kept if the regex
+    # also matches within that line alone (newline included, as the old
+    # per-line search saw it). The next search resumes after those lines.
+    # With line_search, regex is only the widened prefilter: a candidate
+    # line is decoded (CRLF folded, as the text-mode read did) and checked
+    # with line_search instead.
+    # Returns (n, text): the n snippets go into one flat line list, each
+    # followed by two "" so that a single "\n".join leaves a blank line
+    # between them
+    out, count = [], 0
+    search = regex.search
+    m = search(data)
+    if m is None or not data:
+        return count, ""
+    as_text = isinstance(data, str)
+    nl = [n.start() for n in (_NEWLINE_TEXT_RE if as_text else _NEWLINE_RE).finditer(data)]
+    n_lines = len(nl) + (data[-1] not in (0x0A, "\n"))
+    rel_path = relpath(path)
+    while m is not None:
+        first = bisect_left(nl, m.start())
+        if first >= n_lines:
+            break  # an empty match after the final newline
+        last = min(bisect_left(nl, max(m.start(), m.end() - 1)), n_lines - 1)
+        for idx in range(first, last + 1):
+            line_lo = nl[idx - 1] + 1 if idx else 0
+            line_hi = nl[idx] + 1 if idx < len(nl) else len(data)
+            if line_search is None:
+                if search(data, line_lo, line_hi) is None:
+                    continue
+            else:
+                line = data[line_lo:line_hi].decode("utf-8", "ignore")
+                if line.endswith("\r\n"):
+                    line = line[:-2] + "\n"
+                if line_search(line) is None:
+                    continue
+            start = max(0, idx - before)
+            end = min(n_lines, idx + after + 1)
+            lo = nl[start - 1] + 1 if start else 0
+            hi = nl[end - 1] if end <= len(nl) else len(data)
+            out.append("=" * 80)
+            out.append(f"{rel_path} (line {idx+1}):")
+            text = data[lo:hi] if as_text else data[lo:hi].decode("utf-8", "ignore")
+            for i, line in enumerate(text.split("\n"), start):
+                prefix = ">>" if i == idx else "  "
+                num = str(i + 1).rjust(4)
+                out.append(f"{prefix} {num}: {line.rstrip()}")
+            out += ("", "")
+            count += 1
+        if last >= len(nl):
+            break
+        m = search(data, nl[last] + 1)
+    if out:
+        out.pop()  # the last snippet keeps just its own trailing newline
+    return count, "\n".join(out)
+
+def iter_cs_references(root_folder, pattern, before=3, after=3):
+    """Search .cs files for regex pattern, yielding (n, text) for each file
+    with hits, in path order; text holds its n context snippets. A bad
+    pattern raises ValueError here, not on the first next()."""
+    try:
+        as_text = _needs_text(pattern)
+        regex = _compile_cs_pattern(pattern, as_text)
     except re.error as e:
         raise ValueError(f"Invalid regex: {e}") from e
+    # A str-only pattern still sweeps the bytes where it has a widened form:
+    # candidate lines are then confirmed per line, without MULTILINE so ^
+    # cannot match after a line's own newline
+    line_search = None
+    if as_text:
+        prefilter = _compile_cs_prefilter(pattern)
+        if prefilter is not None:
+            regex, line_search = prefilter, re.compile(pattern).search
+    # Walk once, sorted for a stable order; searching starts on iteration
+    paths = sorted(_scan_tree(root_folder, _CS_SUFFIXES))
+    search = partial(_search_file, regex, line_search, before, after, _relpath_under(root_folder))
+    return _iter_searches(search, paths)
+
+def _iter_searches(search, paths):
+    # Files are searched concurrently but at most _SEARCH_AHEAD ahead of the
+    # consumer, so only a bounded window of results is ever in memory
+    it = iter(paths)
+    with ThreadPoolExecutor(max_workers=_SEARCH_WORKERS) as ex:
+        pending = deque(ex.submit(search, p) for p in islice(it, _SEARCH_AHEAD))
+        while pending:
+            fut = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(ex.submit(search, nxt))
+            n, text = fut.result()
+            if n:
+                yield n, text
 
-    snippets = []
-    for dirpath, _, filenames in os.walk(root_folder):
-        for fname in filenames:
-            if not fname.lower().endswith(".cs"):
-                continue
-            path = os.path.join(dirpath, fname)
-            try:
-                with open(path, encoding="utf-8", errors="ignore") as f:
-                    lines = f.readlines()
-            except OSError:
-                continue
-            for idx, line in enumerate(lines):
-                if regex.search(line):
-                    start = max(0, idx - before)
-                    end = min(len(lines), idx + after + 1)
-                    snippet_lines = []
-                    snippet_lines.append("=" * 80)
-                    rel_path = os.path.relpath(path, root_folder)
-                    snippet_lines.append(f"{rel_path} (line {idx+1}):")
-                    for i in range(start, end):
-                        prefix = ">>" if i == idx else "  "
-                        num = str(i + 1).rjust(4)
-                        snippet_lines.append(f"{prefix} {num}: {lines[i].rstrip()}")
-                    snippet_lines.append("")
-                    snippets.append("\n".join(snippet_lines))
-    return snippets
+def find_cs_references_with_context(root_folder, pattern, before=3, after=3):
+    """Search .cs files for regex pattern. Returns (text, n): the n context
+    snippets found, joined with blank lines between them."""
+    blocks, total = [], 0
+    for n, text in iter_cs_references(root_folder, pattern, before, after):
+        blocks.append(text)
+        total += n
+    return "\n\n".join(blocks), total
 
 # ---------- Simple theming ----------
 def apply_dark_theme(root, ttk):